@@ -0,0 +1,63 @@
+"""Counting a project's open issues per label: listing every issue versus the aggregation tools.
+
+An agent without aggregation tools lists all ``--issues`` issues with
+``list_project_issues`` and counts their labels itself; ``count_issues_by_label``
+asks GitLab for its per-label counts, and ``aggregate_project_issues`` counts
+over the server's incrementally synced mirror of the project's issues. Reports
+call latency, GitLab requests and the size of the tool result. The first
+``aggregate_project_issues`` call (the initial full sync) is reported apart.
+
+Usage:
+    python -m benchmarks.bench_aggregate [--issues 5000] [--runs 5]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+async def run(stub: RecordedGitLab, runs: int) -> None:
+    from server import mcp
+    from server import _content_bytes
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+    calls = (
+        ("list_project_issues", "list_project_issues", {"project_id": 1}),
+        ("count_issues_by_label", "count_issues_by_label", {"project_id": 1}),
+        ("aggregate_project_issues", "aggregate_project_issues", {"payload": {"project_id": 1, "group_by": "label"}}),
+    )
+    for label, tool, arguments in calls:
+        start = time.perf_counter()
+        result = await mcp.call_tool(tool, arguments)  # warm-up; the first aggregate syncs the mirror
+        if tool == "aggregate_project_issues":
+            report("  first call (full sync)", [time.perf_counter() - start])
+        requests = stub.request_count
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await mcp.call_tool(tool, arguments)
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+        print(f"  requests per call: {(stub.request_count - requests) / runs:.0f}  response: {_content_bytes(result) / 1024:.1f} KiB")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with RecordedGitLab(projects=1, issues=args.issues, notes=0) as stub:
+        configure_env(stub.url)
+        # Every call reaches the stub, as it would once the cached pages expire
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        asyncio.run(run(stub, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Wall time of N parallel tool calls through FastMCP dispatch.
+
+Every call hits a stub server with a fixed injected latency. With blocking
+handlers the calls run one after another (~N x latency); with async handlers
+the network waits overlap (~latency).
+
+Usage:
+    python -m benchmarks.bench_concurrency [--calls 50] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.stub_gitlab import StubGitLab
+
+
+async def run(calls: int) -> None:
+    from server import mcp
+    import tools  # noqa: F401  (registers the tools)
+    from services.gitlab_api import close_client
+
+    async def call(i: int) -> float:
+        start = time.perf_counter()
+        await mcp.call_tool("get_project_details", {"project_id": i})
+        return time.perf_counter() - start
+
+    await call(0)  # warm up the connection pool
+
+    start = time.perf_counter()
+    sequential = [await call(i) for i in range(calls)]
+    sequential_wall = time.perf_counter() - start
+    report("sequential", sequential)
+    print(f"  wall time: {sequential_wall:.3f}s")
+
+    start = time.perf_counter()
+    concurrent = await asyncio.gather(*(call(i) for i in range(calls)))
+    concurrent_wall = time.perf_counter() - start
+    report("concurrent", list(concurrent))
+    print(f"  wall time: {concurrent_wall:.3f}s ({sequential_wall / concurrent_wall:.1f}x faster)")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected server latency in seconds")
+    args = parser.parse_args()
+
+    with StubGitLab(latency=args.latency) as stub:
+        configure_env(stub.url)
+        # Both passes request the same resources; cached responses would hide the network waits
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
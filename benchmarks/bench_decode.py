@@ -0,0 +1,54 @@
+"""CPU cost of decoding list responses into models.
+
+Compares, over recorded issue/merge request/note fixtures expanded to 100,
+1,000 and 10,000 items:
+
+* per-item: ``response.json()`` followed by ``Model(**item)`` for each item
+* bulk: ``TypeAdapter(List[Model]).validate_json(body)`` in one pass
+* bulk trusted: the same with URL/datetime re-validation skipped
+
+Usage:
+    python -m benchmarks.bench_decode [--sizes 100 1000 10000] [--repeat 3]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import configure_env, expand_fixture
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    configure_env("http://127.0.0.1")
+    from pydantic import TypeAdapter
+    from typing import List
+    from schemas.decoding import trusted_model
+    from schemas.info_schemas import Issue, MergeRequest, Note
+
+    print(f"{'fixture':<14}{'items':>7}{'per-item':>12}{'bulk':>12}{'trusted':>12}")
+    for fixture, model in (("issue", Issue), ("merge_request", MergeRequest), ("note", Note)):
+        bulk = TypeAdapter(List[model])
+        trusted = TypeAdapter(List[trusted_model(model)])
+        for size in args.sizes:
+            body = json.dumps(expand_fixture(fixture, size)).encode()
+            per_item = best_of(args.repeat, lambda: [model(**item) for item in json.loads(body)])
+            one_pass = best_of(args.repeat, lambda: bulk.validate_json(body))
+            relaxed = best_of(args.repeat, lambda: trusted.validate_json(body))
+            print(f"{fixture:<14}{size:>7}{per_item * 1000:>10.1f}ms{one_pass * 1000:>10.1f}ms{relaxed * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Encoding a large list result: FastMCP's default output versus the compact table.
+
+Fetches ``--merge-requests`` merge requests once with
+``list_project_merge_requests`` and then times only their encoding into the
+JSON-RPC line a stdio transport writes: with FastMCP's default conversion
+(indented JSON text plus the same data as structured content), and as the
+compact table of ``compact=True`` (field names once, one row of values per
+merge request, nulls and defaults left out). Reports encoding time and the
+size of the written line.
+
+Usage:
+    python -m benchmarks.bench_encoding [--merge-requests 500] [--runs 20]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+async def run(merge_requests: int, runs: int) -> None:
+    from mcp.types import CallToolResult, JSONRPCMessage, JSONRPCResponse
+
+    from server import mcp
+    from services.gitlab_api import close_client
+    from tools.info_tools import _compact_result
+
+    mcp.load_tools()
+    tool = mcp._tool_manager.get_tool("list_project_merge_requests")
+    result = await tool.run({"payload": {"project_id": 1, "max_items": merge_requests, "compact": False}})
+    print(f"{len(result.merge_requests)} merge requests")
+
+    def default() -> str:
+        content, structured = tool.fn_metadata.convert_result(result)
+        return _line(CallToolResult(content=content, structuredContent=structured))
+
+    def compact() -> str:
+        return _line(tool.fn_metadata.convert_result(_compact_result(result)))
+
+    def _line(call_result: CallToolResult) -> str:
+        response = JSONRPCResponse(jsonrpc="2.0", id=1, result=call_result.model_dump(by_alias=True, exclude_none=True))
+        return JSONRPCMessage(response).model_dump_json(by_alias=True, exclude_none=True)
+
+    for label, encode in (("default (pretty JSON)", default), ("compact table", compact)):
+        line = encode()  # warm-up
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            encode()
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+        print(f"  written: {len(line.encode()) / 1024:.0f} KiB")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--merge-requests", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with RecordedGitLab(projects=1, issues=1, notes=0, merge_requests=args.merge_requests) as stub:
+        configure_env(stub.url)
+        asyncio.run(run(args.merge_requests, args.runs))
+
+
+if __name__ == "__main__":
+    main()
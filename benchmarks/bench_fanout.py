@@ -0,0 +1,72 @@
+"""Finding the most recently updated open merge requests across many projects.
+
+Compares an agent calling ``list_project_merge_requests`` once per project in
+sequence with one ``search_merge_requests`` call over the same projects
+(bounded concurrent fan-out and a k-way merge), and over their group (a single
+group-level list). Runs against ``RecordedGitLab`` with injected latency and
+the response cache disabled.
+
+Usage:
+    python -m benchmarks.bench_fanout [--projects 30] [--limit 20] [--latency 0.05] [--runs 3]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+async def run(stub: RecordedGitLab, projects: int, limit: int, runs: int) -> None:
+    from server import mcp
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+    project_ids = list(range(1, projects + 1))
+
+    async def per_project() -> None:
+        for project_id in project_ids:
+            await mcp.call_tool("list_project_merge_requests", {"payload": {
+                "project_id": project_id, "state": "opened", "order_by": "updated_at", "max_items": limit,
+            }})
+
+    async def fan_out() -> None:
+        await mcp.call_tool("search_merge_requests", {"payload": {
+            "project_ids": project_ids, "state": "opened", "max_items": limit,
+        }})
+
+    async def group() -> None:
+        await mcp.call_tool("search_merge_requests", {"payload": {
+            "group_id": "acme", "state": "opened", "max_items": limit,
+        }})
+
+    for label, search in (("one call per project", per_project), ("search_merge_requests", fan_out), ("  by group", group)):
+        await search()  # warm-up
+        requests = stub.request_count
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await search()
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+        print(f"  requests per search: {(stub.request_count - requests) / runs:.0f}")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20, help="Merge requests to find")
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected server latency in seconds")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with RecordedGitLab(projects=args.projects, issues=1, notes=0, latency=args.latency) as stub:
+        configure_env(stub.url)
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        asyncio.run(run(stub, args.projects, args.limit, args.runs))
+
+
+if __name__ == "__main__":
+    main()
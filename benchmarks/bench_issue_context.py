@@ -0,0 +1,61 @@
+"""Loading an issue with its notes and merge requests: three REST tool calls versus one GraphQL query.
+
+An agent gathering an issue's context calls ``get_issue_details``,
+``list_issue_notes`` and ``list_project_merge_requests`` one after another,
+paying a round trip for each; ``get_issue_context`` fetches the same entities
+with a single GraphQL request. Runs against ``RecordedGitLab`` with injected
+latency and the response cache disabled, so every call reaches the server.
+
+Usage:
+    python -m benchmarks.bench_issue_context [--issues 50] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+async def run(stub: RecordedGitLab, issues: int) -> None:
+    from server import mcp
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+
+    async def rest(iid: int) -> None:
+        await mcp.call_tool("get_issue_details", {"project_id": 1, "issue_iid": iid})
+        await mcp.call_tool("list_issue_notes", {"payload": {"project_id": 1, "issue_iid": iid}})
+        await mcp.call_tool("list_project_merge_requests", {"payload": {"project_id": 1, "iids": [iid]}})
+
+    async def graphql(iid: int) -> None:
+        await mcp.call_tool("get_issue_context", {"payload": {"project_id": 1, "issue_iid": iid}})
+
+    for label, load in (("REST (3 tool calls)", rest), ("GraphQL get_issue_context", graphql)):
+        await load(1)  # warm-up: connection, lazily built validators
+        requests = stub.request_count
+        samples = []
+        for iid in range(1, issues + 1):
+            start = time.perf_counter()
+            await load(iid)
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+        print(f"  requests per issue: {(stub.request_count - requests) / issues:.1f}")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected server latency in seconds")
+    args = parser.parse_args()
+
+    with RecordedGitLab(issues=args.issues, latency=args.latency) as stub:
+        configure_env(stub.url)
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        asyncio.run(run(stub, args.issues))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Wall time of walking a paginated issue list sequentially vs. with parallel prefetch.
+
+Usage:
+    python -m benchmarks.bench_pagination [--pages 40] [--latency 0.05] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env
+from benchmarks.stub_gitlab import StubGitLab, paginate_items
+
+
+async def run(stub: StubGitLab, concurrency: int) -> None:
+    from services.gitlab_api import close_client, paginate
+
+    for label, limit in (("sequential", 1), (f"prefetch (concurrency={concurrency})", concurrency)):
+        requests_before = stub.request_count
+        start = time.perf_counter()
+        ids = [issue["id"] async for page in paginate("/projects/1/issues", concurrency=limit) for issue in page]
+        elapsed = time.perf_counter() - start
+        assert ids == sorted(ids), "pages must be yielded in order"
+        print(f"{label:<28} items={len(ids):<6} requests={stub.request_count - requests_before:<4} wall={elapsed:.3f}s")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected server latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    issues = [{"id": i, "iid": i, "project_id": 1, "title": f"Issue {i}"} for i in range(1, args.pages * 100 + 1)]
+    with StubGitLab(latency=args.latency) as stub:
+        stub.add_route("GET", r"/projects/1/issues", lambda m, q, b: paginate_items(issues, q, "/api/v4/projects/1/issues"))
+        configure_env(stub.url)
+        # Both passes request the same pages; cached responses would not measure the transport
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        asyncio.run(run(stub, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
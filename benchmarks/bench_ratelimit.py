@@ -0,0 +1,68 @@
+"""Tool calls against a rate-limited GitLab, with and without the request scheduler.
+
+The stub allows ``--limit`` requests per second and answers the rest with
+``429 Too Many Requests``. Without pacing or retries a burst of calls fails
+once the window is used up; with the scheduler the calls are spread over the
+windows the limit allows and all of them succeed.
+
+Usage:
+    python -m benchmarks.bench_ratelimit [--calls 200] [--limit 50] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import configure_env, report
+from benchmarks.stub_gitlab import StubGitLab
+
+
+async def run(stub: StubGitLab, calls: int) -> None:
+    from server import mcp
+    import tools  # noqa: F401  (registers the tools)
+    from services.gitlab_api import close_client
+    from services.scheduler import scheduler
+
+    async def call(i: int) -> tuple[bool, float]:
+        start = time.perf_counter()
+        try:
+            await mcp.call_tool("get_project_details", {"project_id": i})
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    configured = (scheduler.rate, scheduler.max_retries)
+    for label, rate, max_retries in (("unscheduled", 0.0, 0), ("scheduled", *configured)):
+        scheduler.rate, scheduler.max_retries = rate, max_retries
+        await asyncio.sleep(stub.rate_window)  # start from a fresh rate-limit window
+        stub.throttled_count = 0
+        start = time.perf_counter()
+        results = await asyncio.gather(*(call(i) for i in range(calls)))
+        wall = time.perf_counter() - start
+        succeeded = [duration for ok, duration in results if ok]
+        report(label, [duration for _, duration in results])
+        print(
+            f"  succeeded: {len(succeeded)}/{calls}  429s: {stub.throttled_count}  "
+            f"wall time: {wall:.3f}s  throughput: {len(succeeded) / wall:.1f} calls/s"
+        )
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50, help="Requests per second allowed by the stub")
+    parser.add_argument("--latency", type=float, default=0.02, help="Injected server latency in seconds")
+    args = parser.parse_args()
+
+    with StubGitLab(latency=args.latency, rate_limit=args.limit) as stub:
+        configure_env(stub.url)
+        os.environ["GITLAB_CACHE_ENABLED"] = "false"
+        os.environ["GITLAB_RATE_LIMIT"] = str(args.limit)
+        os.environ.setdefault("GITLAB_BACKOFF_BASE", "0.1")
+        asyncio.run(run(stub, args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Cold start of the stdio server: time from process launch to the first ``tools/list`` response.
+
+Each run spawns ``python main.py`` the way an IDE does, sends ``initialize``,
+``notifications/initialized`` and ``tools/list`` over stdin, and stops the
+clock when the tool list arrives on stdout. The server never contacts GitLab
+during startup, so no stub is needed.
+
+Runs are measured twice: on a first launch, when the tool modules must be
+imported to build the tool list, and with the tool-list manifest written by
+an earlier launch, when they are not imported until the first tool call.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import ROOT, report
+
+
+MESSAGES = [
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "bench-startup", "version": "0"},
+        },
+    },
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def time_to_tools_list(manifest_dir: str) -> tuple[float, float, int]:
+    """Return (seconds to initialize result, seconds to tools/list result, number of tools)."""
+    env = dict(
+        os.environ,
+        GITLAB_API_PAT="benchmark-token",
+        GITLAB_URL="http://127.0.0.1:9",
+        MCP_TRANSPORT="stdio",
+        MCP_TOOL_MANIFEST_DIR=manifest_dir,
+    )
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "main.py")],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        proc.stdin.write("".join(json.dumps(message) + "\n" for message in MESSAGES).encode())
+        proc.stdin.flush()
+        initialized = None
+        for line in proc.stdout:
+            message = json.loads(line)
+            if message.get("id") == 1:
+                initialized = time.perf_counter() - start
+            elif message.get("id") == 2:
+                return initialized, time.perf_counter() - start, len(message["result"]["tools"])
+        raise RuntimeError("server exited before answering tools/list")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cached:
+        time_to_tools_list(cached)  # warms the OS file cache and __pycache__, and writes the manifest
+        for label, manifest_dir in (("first launch", None), ("cached manifest", cached)):
+            results = []
+            for _ in range(args.runs):
+                with tempfile.TemporaryDirectory() as empty:
+                    results.append(time_to_tools_list(manifest_dir or empty))
+            report(f"{label}: initialize", [initialized for initialized, _, _ in results])
+            report(f"{label}: tools/list", [listed for _, listed, _ in results])
+        print(f"  tools listed: {results[0][2]}")
+
+
+if __name__ == "__main__":
+    main()
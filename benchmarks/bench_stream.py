@@ -0,0 +1,77 @@
+"""Peak Python memory of listing users page-buffered vs. with incremental decoding.
+
+Each mode is measured twice: collecting every validated ``User`` (the result
+list dominates, so streaming gains nothing) and only counting them, which
+isolates the per-page working set that incremental decoding bounds. The
+latter is how ``tools.info_tools._thread_notes`` consumes issue notes.
+
+Usage:
+    python -m benchmarks.bench_stream [--users 5000] [--per-page 100]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.common import configure_env, expand_fixture
+from benchmarks.stub_gitlab import StubGitLab, paginate_items
+
+
+async def measure(label: str, run) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = await run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} users={count:<6} peak={peak / 1024:9.0f}KiB wall={elapsed:.3f}s")
+
+
+async def run(per_page: int) -> None:
+    from schemas.decoding import item_validator, list_decoder
+    from schemas.info_schemas import User
+    from services.gitlab_api import close_client, paginate, stream_items
+
+    def buffered(collect: bool):
+        async def run():
+            users, count = [], 0
+            async for page in paginate("/users", per_page=per_page, use_cache=False, concurrency=1, decode=list_decoder(User)):
+                count += len(page)
+                if collect:
+                    users.extend(page)
+            return count
+        return run
+
+    def streamed(collect: bool):
+        async def run():
+            users, count = [], 0
+            async for user in stream_items("/users", per_page=per_page, validate=item_validator(User)):
+                count += 1
+                if collect:
+                    users.append(user)
+            return count
+        return run
+
+    await buffered(False)()  # warm up connections and validators
+    for collect in (True, False):
+        suffix = "collect" if collect else "count"
+        await measure(f"page-buffered/{suffix}", buffered(collect))
+        await measure(f"streamed/{suffix}", streamed(collect))
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--per-page", type=int, default=100)
+    args = parser.parse_args()
+
+    users = expand_fixture("user", args.users)
+    with StubGitLab() as stub:
+        stub.add_route("GET", r"/users", lambda m, q, b: paginate_items(users, q, "/api/v4/users"))
+        configure_env(stub.url)
+        asyncio.run(run(args.per_page))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Loading a long issue thread: full notes versus notes that reference interned authors.
+
+A single issue with ``--notes`` notes by a handful of participants is loaded
+with ``list_issue_notes(all_pages=True)``, where every note carries its full
+author object, and with ``load_issue_thread``, where authors are listed once
+and notes refer to them by ID. Reports call latency, the size of the tool
+result and peak traced memory of one call.
+
+Usage:
+    python -m benchmarks.bench_thread [--notes 3000] [--runs 5]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.common import configure_env, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+async def run(notes: int, runs: int) -> None:
+    from server import mcp
+    from server import _content_bytes
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+    calls = (
+        ("list_issue_notes(all_pages)", "list_issue_notes", {"payload": {"project_id": 1, "issue_iid": 1, "all_pages": True}}),
+        ("load_issue_thread", "load_issue_thread", {"payload": {"project_id": 1, "issue_iid": 1}}),
+    )
+    for label, tool, arguments in calls:
+        result = await mcp.call_tool(tool, arguments)  # warm-up
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await mcp.call_tool(tool, arguments)
+            samples.append(time.perf_counter() - start)
+        tracemalloc.start()
+        await mcp.call_tool(tool, arguments)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report(label, samples)
+        print(f"  response: {_content_bytes(result) / 1024:.0f} KiB  peak memory: {peak / 1024:.0f} KiB")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=3000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with RecordedGitLab(projects=1, issues=1, notes=args.notes, merge_requests=1, branches=1, users=8) as stub:
+        configure_env(stub.url)
+        asyncio.run(run(args.notes, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-call latency of a fresh connection per request vs. the pooled transport.
+
+Usage:
+    python -m benchmarks.bench_transport [--requests 500] [--latency 0.0]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import configure_env, report
+from benchmarks.stub_gitlab import StubGitLab
+
+
+async def run(stub: StubGitLab, requests: int) -> None:
+    from config.config import GITLAB_API_PAT
+    from services.gitlab_api import close_client, gitlab_request
+
+    headers = {"Authorization": f"Bearer {GITLAB_API_PAT}"}
+    before = []
+    connections = stub.connection_count
+    for i in range(requests):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            (await client.get(f"{stub.url}/api/v4/projects/{i}", headers=headers)).raise_for_status()
+        before.append(time.perf_counter() - start)
+    report("before (connection per call)", before)
+    print(f"  connections opened: {stub.connection_count - connections}")
+
+    after = []
+    connections = stub.connection_count
+    for i in range(requests):
+        start = time.perf_counter()
+        await gitlab_request("GET", f"/projects/{i}")
+        after.append(time.perf_counter() - start)
+    report("after (pooled transport)", after)
+    print(f"  connections opened: {stub.connection_count - connections}")
+    await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected server latency in seconds")
+    args = parser.parse_args()
+
+    with StubGitLab(latency=args.latency) as stub:
+        configure_env(stub.url)
+        asyncio.run(run(stub, args.requests))
+
+if __name__ == "__main__":
+    main()
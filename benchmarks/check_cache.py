@@ -0,0 +1,131 @@
+"""Read-after-write checks of the response cache against ``RecordedGitLab``.
+
+Each check reads through the cache, writes through a tool, and reads again,
+expecting the write to be visible. Projects are addressed both by ID and by
+URL-encoded path, which the tool schemas allow; one check holds a read in
+flight across the write. Exits non-zero when a check fails, so it can run
+next to the benchmark suite.
+
+Usage:
+    python -m benchmarks.check_cache
+"""
+import asyncio
+import sys
+import threading
+from typing import Awaitable, Callable
+
+from benchmarks.common import configure_env
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+PROJECT_IDS = (1, "acme%2Fproject-1")
+
+failures: list[str] = []
+
+
+def _expect(condition: bool, description: str) -> None:
+    print(f"{'ok  ' if condition else 'FAIL'} {description}")
+    if not condition:
+        failures.append(description)
+
+
+async def check_issue_writes(project_id) -> None:
+    from server import mcp
+    from services.gitlab_api import gitlab_request
+
+    issues = f"/projects/{project_id}/issues"
+    page = {"per_page": 100}
+    before = len(await gitlab_request("GET", issues, page))
+    created = await mcp.call_tool("create_issue", {"payload": {"project_id": project_id, "title": "Cache check"}})
+    iid = created[1]["iid"]
+    _expect(len(await gitlab_request("GET", issues, page)) == before + 1, f"{issues} shows the created issue")
+
+    notes = f"{issues}/{iid}/notes"
+    before = len(await gitlab_request("GET", notes))
+    await mcp.call_tool("create_issue_note", {"payload": {"project_id": project_id, "issue_iid": iid, "body": "Cache check"}})
+    _expect(len(await gitlab_request("GET", notes)) == before + 1, f"{notes} shows the created note")
+
+
+async def check_cross_project_lists(scope: dict) -> None:
+    """Search issues and merge requests of a group or the instance around writes to one project."""
+    from server import mcp
+
+    where = f"group {scope['group_id']}" if scope else "the instance"
+    for search, create, key, payload in (
+        ("search_issues", "create_issue", "issues", {"title": "Cache check"}),
+        ("search_merge_requests", "create_merge_request", "merge_requests",
+         {"title": "Cache check", "source_branch": "feature/branch-1", "target_branch": "main"}),
+    ):
+        before = len((await mcp.call_tool(search, {"payload": scope}))[1][key])
+        await mcp.call_tool(create, {"payload": {"project_id": 1, **payload}})
+        after = len((await mcp.call_tool(search, {"payload": scope}))[1][key])
+        _expect(after == before + 1, f"{search} over {where} shows the created item")
+
+
+async def check_issue_statistics(scope: dict) -> None:
+    """Count issues of a project, a group or the instance around an issue creation."""
+    from server import mcp
+
+    where = ", ".join(f"{key} {value}" for key, value in scope.items()) or "the instance"
+    before = (await mcp.call_tool("get_issue_statistics", {"payload": scope}))[1]["all"]
+    project_id = scope.get("project_id", 1)
+    await mcp.call_tool("create_issue", {"payload": {"project_id": project_id, "title": "Cache check"}})
+    after = (await mcp.call_tool("get_issue_statistics", {"payload": scope}))[1]["all"]
+    _expect(after == before + 1, f"get_issue_statistics over {where} counts the created issue")
+
+
+async def check_in_flight_write(stub: RecordedGitLab, project_id: int) -> None:
+    """Hold a list read at GitLab until an issue is created and a second read has returned."""
+    from server import mcp
+    from services.gitlab_api import gitlab_request
+
+    issues = f"/projects/{project_id}/issues"
+    page = {"per_page": 100}
+    before = len(stub.issues[project_id])
+    read, release = threading.Event(), threading.Event()
+
+    def held_list(match, query, body):
+        result = stub._list_issues(match, query, body)
+        if not read.is_set():
+            read.set()
+            release.wait(10)
+        return result
+
+    stub.add_route("GET", f"/projects/(?P<project>{project_id})/issues", held_list)
+    first = asyncio.create_task(gitlab_request("GET", issues, page))
+    await asyncio.to_thread(read.wait, 10)
+    await mcp.call_tool("create_issue", {"payload": {"project_id": project_id, "title": "Cache check"}})
+    second = await gitlab_request("GET", issues, page)
+    release.set()
+    await first
+    _expect(len(second) == before + 1, f"{issues} read after the write does not join the read in flight")
+    _expect(len(await gitlab_request("GET", issues, page)) == before + 1, f"{issues} read in flight is not cached")
+
+
+async def run(checks: list[Callable[[], Awaitable[None]]]) -> None:
+    from server import mcp
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+    for check in checks:
+        await check()
+    await close_client()
+
+
+def main() -> None:
+    with RecordedGitLab(projects=2, issues=50, notes=5) as stub:
+        configure_env(stub.url)
+        checks = [lambda project_id=project_id: check_issue_writes(project_id) for project_id in PROJECT_IDS]
+        checks += [lambda scope=scope: check_cross_project_lists(scope) for scope in ({"group_id": "acme"}, {})]
+        checks += [
+            lambda scope=scope: check_issue_statistics(scope)
+            for scope in ({"project_id": 1}, {"project_id": "acme%2Fproject-1"}, {"group_id": "acme"}, {})
+        ]
+        checks.append(lambda: check_in_flight_write(stub, 2))
+        asyncio.run(run(checks))
+    if failures:
+        sys.exit(f"{len(failures)} cache check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
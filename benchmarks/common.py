@@ -0,0 +1,57 @@
+"""Shared helpers for the benchmark scripts."""
+import json
+import logging
+import os
+import statistics
+import sys
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def configure_env(stub_url: str) -> None:
+    """Point the server configuration at a stub instance before ``config`` is imported."""
+    os.environ["GITLAB_URL"] = stub_url
+    os.environ.setdefault("GITLAB_API_PAT", "benchmark-token")
+    # The stub is not rate limited; pacing would only measure the token bucket
+    os.environ.setdefault("GITLAB_RATE_LIMIT", "0")
+    # FastMCP enables INFO logging; per-request httpx log lines would dominate the output
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, samples: list[float]) -> None:
+    """Print p50/p99/mean latency in milliseconds for a list of durations in seconds."""
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<28} n={len(ms):<5} p50={percentile(ms, 50):8.3f}ms "
+        f"p99={percentile(ms, 99):8.3f}ms mean={statistics.fmean(ms):8.3f}ms"
+    )
+
+
+def load_fixture(name: str) -> dict[str, Any]:
+    """Load a recorded GitLab API object from ``benchmarks/fixtures/<name>.json``."""
+    return json.loads((FIXTURES / f"{name}.json").read_text())
+
+
+def expand_fixture(name: str, count: int) -> list[dict[str, Any]]:
+    """Return ``count`` copies of a recorded object with distinct ``id``/``iid`` values."""
+    template = load_fixture(name)
+    items = []
+    for i in range(1, count + 1):
+        item = json.loads(json.dumps(template))
+        item["id"] = i
+        if "iid" in item:
+            item["iid"] = i
+        items.append(item)
+    return items
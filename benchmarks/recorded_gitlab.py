@@ -0,0 +1,438 @@
+"""An in-memory GitLab instance built from the recorded API fixtures.
+
+``RecordedGitLab`` extends the stub server with every route the tools use:
+projects, issues (read, create, edit, delete), issue statistics, issue notes,
+merge requests, labels (optionally with counts), branches and users, plus the
+GraphQL issue context query. Responses are copies of the recorded objects in
+``benchmarks/fixtures`` with distinct IDs, paginated like GitLab, and writes
+update the in-memory state so that read-after-write workloads behave as they
+would against a real instance. Latency, rate limiting and injected errors are
+configured as on ``StubGitLab``.
+"""
+import copy
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from urllib.parse import parse_qsl, unquote
+
+from benchmarks.common import load_fixture
+from benchmarks.stub_gitlab import StubGitLab, StubResponse, paginate_items
+
+
+LABEL_NAMES = ("bug", "feature", "documentation", "triaged", "needs-info", "priority::1", "priority::2")
+
+_PROJECT = r"/projects/(?P<project>[^/]+)"
+_ISSUE = rf"{_PROJECT}/issues/(?P<iid>\d+)"
+
+# Generated items are updated a minute apart from this point on
+_RECORDED_AT = datetime(2024, 5, 20, 14, 2, 57, 18000, tzinfo=timezone.utc)
+
+
+def _timestamp(moment: datetime) -> str:
+    """Format ``moment`` as GitLab formats ``updated_at``, e.g. '2024-05-20T14:02:57.018Z'."""
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _now() -> str:
+    return _timestamp(datetime.now(timezone.utc))
+
+
+def _filter_and_sort(items: list[dict], params: dict) -> list[dict]:
+    """Apply the ``state`` and ``updated_after`` filters and the ``order_by``/``sort`` ordering of GitLab list endpoints."""
+    if params.get("state") and params["state"] != "all":
+        items = [item for item in items if item["state"] == params["state"]]
+    if params.get("updated_after"):
+        since = datetime.fromisoformat(params["updated_after"].replace("Z", "+00:00"))
+        items = [item for item in items if datetime.fromisoformat(item["updated_at"].replace("Z", "+00:00")) >= since]
+    if params.get("order_by") in ("created_at", "updated_at", "title"):
+        items = sorted(items, key=lambda item: item[params["order_by"]], reverse=params.get("sort") != "asc")
+    return items
+
+
+def _count_labelled(items: list[dict], state: str, label: str) -> int:
+    return sum(1 for item in items if item["state"] == state and label in (item.get("labels") or ()))
+
+
+# Editable issue attributes copied verbatim from a PUT/POST body
+_ISSUE_FIELDS = ("title", "description", "confidential", "due_date", "weight", "issue_type")
+
+
+class RecordedGitLab(StubGitLab):
+    """A stub GitLab holding ``projects`` projects with generated issues, notes, merge requests, labels and branches.
+
+    Every project gets ``issues`` issues, except those listed in ``issue_counts``
+    (project id -> count), e.g. a single large project for list benchmarks.
+    """
+
+    def __init__(
+        self,
+        projects: int = 3,
+        issues: int = 50,
+        issue_counts: Optional[dict[int, int]] = None,
+        notes: int = 5,
+        merge_requests: int = 20,
+        branches: int = 20,
+        users: int = 100,
+        **stub_options: Any,
+    ):
+        super().__init__(**stub_options)
+        self._state = threading.Lock()
+        self._ids = itertools.count(1_000_000)
+        templates = {name: load_fixture(name) for name in ("project", "issue", "note", "merge_request", "label", "branch", "user")}
+        self._templates = templates
+
+        self.users = [self._copy("user", id=i, username=f"user{i}", name=f"User {i}") for i in range(1, users + 1)]
+        self.projects: dict[int, dict] = {}
+        self.issues: dict[int, dict[int, dict]] = {}
+        self.notes: dict[tuple[int, int], list[dict]] = {}
+        self.merge_requests: dict[int, dict[int, dict]] = {}
+        self.labels: dict[int, list[dict]] = {}
+        self.branches: dict[int, list[dict]] = {}
+        for project_id in range(1, projects + 1):
+            path = f"acme/project-{project_id}"
+            self.projects[project_id] = self._copy(
+                "project", id=project_id, name=f"project-{project_id}", path=f"project-{project_id}",
+                path_with_namespace=path, web_url=f"https://gitlab.example.com/{path}",
+            )
+            count = (issue_counts or {}).get(project_id, issues)
+            self.issues[project_id] = {iid: self._issue(project_id, iid) for iid in range(1, count + 1)}
+            for iid in range(1, count + 1):
+                self.notes[(project_id, iid)] = [self._note(project_id, iid) for _ in range(notes)]
+            self.merge_requests[project_id] = {
+                iid: self._copy(
+                    "merge_request", id=next(self._ids), iid=iid, project_id=project_id,
+                    updated_at=_timestamp(_RECORDED_AT + timedelta(minutes=iid)),
+                )
+                for iid in range(1, merge_requests + 1)
+            }
+            self.labels[project_id] = [
+                self._copy("label", id=next(self._ids), name=name) for name in LABEL_NAMES
+            ]
+            self.branches[project_id] = [self._copy("branch", name=f"feature/branch-{i}") for i in range(1, branches + 1)]
+
+        self.add_route("GET", r"/projects", self._list_projects)
+        self.add_route("GET", rf"{_PROJECT}", self._get_project)
+        self.add_route("GET", rf"{_PROJECT}/issues", self._list_issues)
+        self.add_route("POST", rf"{_PROJECT}/issues", self._create_issue)
+        self.add_route("GET", _ISSUE, self._get_issue)
+        self.add_route("PUT", _ISSUE, self._edit_issue)
+        self.add_route("DELETE", _ISSUE, self._delete_issue)
+        self.add_route("GET", rf"{_ISSUE}/notes", self._list_notes)
+        self.add_route("POST", rf"{_ISSUE}/notes", self._create_note)
+        self.add_route("GET", rf"{_PROJECT}/merge_requests", self._list_merge_requests)
+        self.add_route("POST", rf"{_PROJECT}/merge_requests", self._create_merge_request)
+        self.add_route("GET", rf"{_PROJECT}/merge_requests/(?P<iid>\d+)", self._get_merge_request)
+        self.add_route("GET", r"(/groups/acme)?/issues", self._list_all_issues)
+        self.add_route("GET", r"(/groups/acme)?/merge_requests", self._list_all_merge_requests)
+        self.add_route("GET", rf"{_PROJECT}/issues_statistics", self._issue_statistics)
+        self.add_route("GET", r"(/groups/acme)?/issues_statistics", self._issue_statistics)
+        self.add_route("GET", rf"{_PROJECT}/labels", self._list_labels)
+        self.add_route("GET", rf"{_PROJECT}/repository/branches", self._list_branches)
+        self.add_route("GET", r"/users", self._list_users)
+        self.add_route("POST", r"/graphql", self._graphql, prefix="/api")
+
+    def _copy(self, fixture: str, **overrides: Any) -> dict:
+        item = copy.deepcopy(self._templates[fixture])
+        item.update(overrides)
+        return item
+
+    def _issue(self, project_id: int, iid: int) -> dict:
+        return self._copy(
+            "issue", id=next(self._ids), iid=iid, project_id=project_id, title=f"Issue {iid} of project {project_id}",
+            labels=["bug"], web_url=f"https://gitlab.example.com/acme/project-{project_id}/-/issues/{iid}",
+            updated_at=_timestamp(_RECORDED_AT + timedelta(minutes=iid)),
+        )
+
+    def _note(self, project_id: int, iid: int, body: Optional[str] = None) -> dict:
+        note_id = next(self._ids)
+        # Discussions involve a handful of participants
+        author = self.users[note_id % min(len(self.users), 8)] if self.users else self._templates["note"]["author"]
+        note = self._copy("note", id=note_id, project_id=project_id, noteable_iid=iid, author=author)
+        if body is not None:
+            note["body"] = body
+        return note
+
+    def _project_id(self, match) -> int:
+        project = unquote(match["project"])
+        if project.isdigit():
+            return int(project)
+        for project_id, data in self.projects.items():
+            if data["path_with_namespace"] == project:
+                return project_id
+        return -1
+
+    @staticmethod
+    def _not_found() -> StubResponse:
+        return StubResponse({"message": "404 Not found"}, status=404)
+
+    def _list_projects(self, match, query, body) -> StubResponse:
+        return paginate_items(list(self.projects.values()), query, "/api/v4/projects")
+
+    def _get_project(self, match, query, body) -> Any:
+        return self.projects.get(self._project_id(match)) or self._not_found()
+
+    def _list_issues(self, match, query, body) -> Any:
+        project_id = self._project_id(match)
+        if project_id not in self.issues:
+            return self._not_found()
+        params = dict(parse_qsl(query))
+        with self._state:
+            issues = list(self.issues[project_id].values())
+        return paginate_items(self._filter_issues(issues, params), query, f"/api/v4/projects/{match['project']}/issues")
+
+    @staticmethod
+    def _filter_issues(issues: list[dict], params: dict) -> list[dict]:
+        if params.get("labels"):
+            wanted = set(params["labels"].split(","))
+            issues = [issue for issue in issues if wanted <= set(issue["labels"])]
+        return _filter_and_sort(issues, params)
+
+    def _list_all_issues(self, match, query, body) -> Any:
+        """Issues of every project, for the group (all projects are in group 'acme') and instance endpoints."""
+        with self._state:
+            issues = [issue for issues in self.issues.values() for issue in issues.values()]
+        return paginate_items(self._filter_issues(issues, dict(parse_qsl(query))), query, match.string)
+
+    def _issue_statistics(self, match, query, body) -> Any:
+        """Issue counts by state of one project, or of every project for the group and instance endpoints."""
+        params = {key: value for key, value in parse_qsl(query) if key != "state"}
+        with self._state:
+            if match.groupdict().get("project") is None:
+                issues = [issue for issues in self.issues.values() for issue in issues.values()]
+            elif self._project_id(match) in self.issues:
+                issues = list(self.issues[self._project_id(match)].values())
+            else:
+                return self._not_found()
+        states = [issue["state"] for issue in self._filter_issues(issues, params)]
+        counts = {"all": len(states), "closed": states.count("closed"), "opened": states.count("opened")}
+        return {"statistics": {"counts": counts}}
+
+    def _get_issue(self, match, query, body) -> Any:
+        issue = self.issues.get(self._project_id(match), {}).get(int(match["iid"]))
+        return issue or self._not_found()
+
+    def _create_issue(self, match, query, body) -> Any:
+        project_id = self._project_id(match)
+        if project_id not in self.issues:
+            return self._not_found()
+        with self._state:
+            issues = self.issues[project_id]
+            iid = int(body.get("iid") or max(issues, default=0) + 1)
+            issue = self._issue(project_id, iid)
+            self._apply_issue_edit(issue, body)
+            issues[iid] = issue
+            self.notes[(project_id, iid)] = []
+        return StubResponse(issue, status=201)
+
+    def _edit_issue(self, match, query, body) -> Any:
+        issue = self.issues.get(self._project_id(match), {}).get(int(match["iid"]))
+        if issue is None:
+            return self._not_found()
+        with self._state:
+            self._apply_issue_edit(issue, body)
+        return issue
+
+    @staticmethod
+    def _apply_issue_edit(issue: dict, body: dict) -> None:
+        for field in _ISSUE_FIELDS:
+            if field in body:
+                issue[field] = body[field]
+        if "labels" in body:
+            issue["labels"] = [label for label in body["labels"].split(",") if label]
+        for label in (body.get("add_labels") or "").split(","):
+            if label and label not in issue["labels"]:
+                issue["labels"].append(label)
+        removed = set((body.get("remove_labels") or "").split(","))
+        issue["labels"] = [label for label in issue["labels"] if label not in removed]
+        if body.get("state_event") in ("close", "reopen"):
+            issue["state"] = "closed" if body["state_event"] == "close" else "opened"
+        issue["updated_at"] = _now()
+
+    def _delete_issue(self, match, query, body) -> Any:
+        project_id = self._project_id(match)
+        with self._state:
+            issue = self.issues.get(project_id, {}).pop(int(match["iid"]), None)
+        return StubResponse(None, status=204) if issue else self._not_found()
+
+    def _list_notes(self, match, query, body) -> Any:
+        notes = self.notes.get((self._project_id(match), int(match["iid"])))
+        if notes is None:
+            return self._not_found()
+        return paginate_items(notes, query, f"/api/v4/projects/{match['project']}/issues/{match['iid']}/notes")
+
+    def _create_note(self, match, query, body) -> Any:
+        key = (self._project_id(match), int(match["iid"]))
+        if key not in self.notes:
+            return self._not_found()
+        note = self._note(*key, body=body["body"])
+        with self._state:
+            self.notes[key].append(note)
+            self.issues[key[0]][key[1]]["updated_at"] = note["updated_at"] = _now()
+        return StubResponse(note, status=201)
+
+    def _list_merge_requests(self, match, query, body) -> Any:
+        merge_requests = self.merge_requests.get(self._project_id(match))
+        if merge_requests is None:
+            return self._not_found()
+        merge_requests = _filter_and_sort(list(merge_requests.values()), dict(parse_qsl(query)))
+        return paginate_items(merge_requests, query, f"/api/v4/projects/{match['project']}/merge_requests")
+
+    def _list_all_merge_requests(self, match, query, body) -> Any:
+        """Merge requests of every project, for the group and instance endpoints."""
+        with self._state:
+            merge_requests = [mr for merge_requests in self.merge_requests.values() for mr in merge_requests.values()]
+        return paginate_items(_filter_and_sort(merge_requests, dict(parse_qsl(query))), query, match.string)
+
+    def _get_merge_request(self, match, query, body) -> Any:
+        merge_request = self.merge_requests.get(self._project_id(match), {}).get(int(match["iid"]))
+        return merge_request or self._not_found()
+
+    def _create_merge_request(self, match, query, body) -> Any:
+        project_id = self._project_id(match)
+        if project_id not in self.merge_requests:
+            return self._not_found()
+        with self._state:
+            merge_requests = self.merge_requests[project_id]
+            iid = max(merge_requests, default=0) + 1
+            merge_request = self._copy(
+                "merge_request", id=next(self._ids), iid=iid, project_id=project_id, updated_at=_now(),
+                **{key: body[key] for key in ("title", "source_branch", "target_branch", "description") if key in body},
+            )
+            merge_requests[iid] = merge_request
+        return StubResponse(merge_request, status=201)
+
+    def _list_labels(self, match, query, body) -> Any:
+        project_id = self._project_id(match)
+        labels = self.labels.get(project_id)
+        if labels is None:
+            return self._not_found()
+        if dict(parse_qsl(query)).get("with_counts") == "true":
+            with self._state:
+                issues = list(self.issues[project_id].values())
+                merge_requests = list(self.merge_requests[project_id].values())
+            labels = [
+                {
+                    **label,
+                    "open_issues_count": _count_labelled(issues, "opened", label["name"]),
+                    "closed_issues_count": _count_labelled(issues, "closed", label["name"]),
+                    "open_merge_requests_count": _count_labelled(merge_requests, "opened", label["name"]),
+                }
+                for label in labels
+            ]
+        return paginate_items(labels, query, f"/api/v4/projects/{match['project']}/labels")
+
+    def _list_branches(self, match, query, body) -> Any:
+        branches = self.branches.get(self._project_id(match))
+        if branches is None:
+            return self._not_found()
+        return paginate_items(branches, query, f"/api/v4/projects/{match['project']}/repository/branches")
+
+    def _list_users(self, match, query, body) -> StubResponse:
+        username = dict(parse_qsl(query)).get("username")
+        users = [user for user in self.users if user["username"] == username] if username else self.users
+        return paginate_items(users, query, "/api/v4/users")
+
+    def _graphql(self, match, query, body) -> Any:
+        """Answer the issue context query of ``services.graphql`` (the only GraphQL query the tools send)."""
+        variables = body["variables"]
+        if "ids" in variables:
+            projects = [int(global_id.rsplit("/", 1)[1]) for global_id in variables["ids"]]
+        else:
+            projects = [self._project_id({"project": variables["fullPath"]})]
+        nodes = []
+        for project_id in projects:
+            if project_id not in self.projects:
+                continue
+            issue = self.issues[project_id].get(int(variables["iid"]))
+            nodes.append({"issue": issue and self._graphql_issue(issue, variables["notes"], variables["mergeRequests"])})
+        if "ids" in variables:
+            return {"data": {"projects": {"nodes": nodes}}}
+        return {"data": {"project": nodes[0] if nodes else None}}
+
+    def _graphql_issue(self, issue: dict, notes: int, merge_requests: int) -> dict:
+        project_id = issue["project_id"]
+        with self._state:
+            issue_notes = list(self.notes.get((project_id, issue["iid"]), []))
+        # The merge request sharing the issue's iid stands in for the merge requests that mention it
+        related = [mr for mr in (self.merge_requests[project_id].get(issue["iid"]),) if mr]
+        milestone = issue.get("milestone")
+        return {
+            "id": f"gid://gitlab/Issue/{issue['id']}",
+            "iid": str(issue["iid"]),
+            "projectId": project_id,
+            **_camel(issue, (
+                "title", "description", "state", "type", "created_at", "updated_at", "closed_at", "due_date",
+                "confidential", "discussion_locked", "subscribed", "web_url", "upvotes", "downvotes",
+                "user_notes_count", "merge_requests_count", "severity",
+            )),
+            "blockingCount": issue.get("blocking_issues_count"),
+            "reference": (issue.get("references") or {}).get("full"),
+            **_camel(issue.get("time_stats") or {}, (
+                "time_estimate", "total_time_spent", "human_time_estimate", "human_total_time_spent",
+            )),
+            "taskCompletionStatus": {"count": 0, "completedCount": 0, **_camel(issue.get("task_completion_status") or {}, ("count", "completed_count"))},
+            "author": _graphql_user(issue.get("author")),
+            "assignees": {"nodes": [_graphql_user(user) for user in issue.get("assignees") or []]},
+            "labels": {"nodes": [{"title": label} for label in issue["labels"]]},
+            "milestone": milestone and {
+                "id": f"gid://gitlab/Milestone/{milestone['id']}",
+                "iid": str(milestone["iid"]),
+                **_camel(milestone, ("title", "description", "state", "created_at", "updated_at", "due_date", "start_date", "expired")),
+                "webPath": milestone["web_url"].removeprefix("https://gitlab.example.com"),
+                "projectMilestone": True,
+            },
+            "notes": {
+                "nodes": [
+                    {
+                        "id": f"gid://gitlab/Note/{note['id']}",
+                        **_camel(note, ("body", "system", "internal", "resolvable", "created_at", "updated_at")),
+                        "author": _graphql_user(note.get("author")),
+                    }
+                    for note in issue_notes[:notes]
+                ],
+                "pageInfo": {"hasNextPage": len(issue_notes) > notes},
+            },
+            "relatedMergeRequests": {
+                "nodes": [_graphql_merge_request(mr) for mr in related[:merge_requests]],
+                "pageInfo": {"hasNextPage": len(related) > merge_requests},
+            },
+        }
+
+
+def _camel(item: dict, fields: tuple[str, ...]) -> dict:
+    """Copy ``fields`` of a REST object under their GraphQL (camelCase) names."""
+    return {
+        field.split("_")[0] + "".join(part.title() for part in field.split("_")[1:]): item.get(field)
+        for field in fields
+    }
+
+
+def _graphql_user(user: Optional[dict]) -> Optional[dict]:
+    if user is None:
+        return None
+    return {
+        "id": f"gid://gitlab/User/{user['id']}",
+        **_camel(user, ("username", "name", "state", "avatar_url", "web_url", "public_email")),
+    }
+
+
+def _graphql_merge_request(mr: dict) -> dict:
+    return {
+        "id": f"gid://gitlab/MergeRequest/{mr['id']}",
+        "iid": str(mr["iid"]),
+        "projectId": mr["project_id"],
+        **_camel(mr, (
+            "title", "description", "state", "created_at", "updated_at", "merged_at", "web_url", "source_branch",
+            "target_branch", "source_project_id", "target_project_id", "draft", "upvotes", "downvotes",
+            "user_notes_count", "merge_commit_sha", "squash", "reference",
+        )),
+        "detailedMergeStatus": (mr.get("detailed_merge_status") or "").upper() or None,
+        "conflicts": mr.get("has_conflicts"),
+        "diffHeadSha": mr.get("sha"),
+        "author": _graphql_user(mr.get("author")),
+        "mergeUser": _graphql_user(mr.get("merge_user")),
+        "assignees": {"nodes": [_graphql_user(user) for user in mr.get("assignees") or []]},
+        "reviewers": {"nodes": [_graphql_user(user) for user in mr.get("reviewers") or []]},
+        "labels": {"nodes": [{"title": label} for label in mr.get("labels") or []]},
+    }
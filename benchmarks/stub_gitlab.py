@@ -0,0 +1,210 @@
+"""Local stub of the GitLab REST API used by the benchmark scripts.
+
+The stub speaks HTTP/1.1 with keep-alive so that connection reuse on the client
+side is observable, and can inject a fixed per-request latency to emulate the
+round trip to a remote GitLab instance. Like GitLab, it sets a weak ``ETag`` on
+successful responses and answers ``If-None-Match`` with ``304 Not Modified``.
+Optionally it enforces a fixed-window rate limit with GitLab's ``RateLimit-*``
+and ``Retry-After`` headers, and fails a share of GET requests with ``503``.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+
+@dataclass
+class StubResponse:
+    payload: Any
+    headers: dict[str, str] = field(default_factory=dict)
+    status: int = 200
+
+
+def paginate_items(items: list[dict], query: str, path: str) -> StubResponse:
+    """Serve ``items`` the way GitLab paginates list endpoints.
+
+    Supports offset pagination (``page``/``per_page`` with ``X-*`` headers and a
+    ``Link`` header) and keyset pagination (``pagination=keyset`` ordered by id).
+    """
+    params = dict(parse_qsl(query))
+    per_page = int(params.get("per_page", 20))
+
+    if params.get("pagination") == "keyset":
+        id_after = int(params.get("id_after", 0))
+        remaining = [item for item in items if item["id"] > id_after]
+        page_items = remaining[:per_page]
+        headers = {}
+        if len(remaining) > per_page:
+            next_query = urlencode({**params, "id_after": page_items[-1]["id"]})
+            headers["Link"] = f'<http://stub{path}?{next_query}>; rel="next"'
+        return StubResponse(page_items, headers)
+
+    page = int(params.get("page", 1))
+    total_pages = max(1, -(-len(items) // per_page))
+    page_items = items[(page - 1) * per_page:page * per_page]
+    headers = {
+        "X-Page": str(page),
+        "X-Per-Page": str(per_page),
+        "X-Total": str(len(items)),
+        "X-Total-Pages": str(total_pages),
+        "X-Next-Page": str(page + 1) if page < total_pages else "",
+    }
+    if page < total_pages:
+        next_query = urlencode({**params, "page": page + 1})
+        headers["Link"] = f'<http://stub{path}?{next_query}>; rel="next"'
+    return StubResponse(page_items, headers)
+
+
+def make_project(project_id: int) -> dict[str, Any]:
+    return {
+        "id": project_id,
+        "name": f"project-{project_id}",
+        "description": "Benchmark project",
+        "web_url": f"https://gitlab.example.com/group/project-{project_id}",
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "last_activity_at": "2024-06-01T00:00:00.000Z",
+        "visibility": "private",
+    }
+
+
+class StubGitLab:
+    """A threaded stub GitLab server bound to an ephemeral localhost port."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 1.0,
+        error_rate: float = 0.0,
+    ):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.connection_count = 0
+        self.not_modified_count = 0
+        self.throttled_count = 0
+        self.error_count = 0
+        self._window_start = time.time()
+        self._window_count = 0
+        self._lock = threading.Lock()
+        self.routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = []
+        self.add_route("GET", r"/version", lambda m, q, b: {"version": "17.0.0-stub"})
+        self.add_route("GET", r"/projects/(?P<id>\d+)", lambda m, q, b: make_project(int(m["id"])))
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def add_route(self, method: str, pattern: str, handler: Callable[..., Any], prefix: str = "/api/v4") -> None:
+        """Register ``handler(match, query, body)`` for requests to ``prefix`` + ``pattern``."""
+        self.routes.insert(0, (method, re.compile(rf"^{prefix}{pattern}$"), handler))
+
+    def _rate_limit_headers(self) -> tuple[dict[str, str], bool]:
+        """Count a request against the current window; return its headers and whether it is throttled."""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.rate_window:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            reset = self._window_start + self.rate_window
+            headers = {
+                "RateLimit-Limit": str(self.rate_limit),
+                "RateLimit-Remaining": str(max(self.rate_limit - self._window_count, 0)),
+                "RateLimit-Reset": f"{reset:.3f}",
+            }
+            throttled = self._window_count > self.rate_limit
+            if throttled:
+                self.throttled_count += 1
+                headers["Retry-After"] = f"{reset - now:.3f}"
+            return headers, throttled
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubGitLab":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                stub.connection_count += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                stub.request_count += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                path, _, query = self.path.partition("?")
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                extra_headers: dict[str, str] = {}
+                if stub.rate_limit is not None:
+                    extra_headers, throttled = stub._rate_limit_headers()
+                    if throttled:
+                        self._send(StubResponse({"message": "429 Too Many Requests"}, extra_headers, 429))
+                        return
+                if stub.error_rate and method == "GET" and random.random() < stub.error_rate:
+                    stub.error_count += 1
+                    self._send(StubResponse({"message": "503 Service Unavailable"}, status=503))
+                    return
+                for route_method, pattern, handler in stub.routes:
+                    match = pattern.match(path)
+                    if route_method == method and match:
+                        result = handler(match, query, body)
+                        if not isinstance(result, StubResponse):
+                            result = StubResponse(result)
+                        result.headers = {**result.headers, **extra_headers}
+                        self._send(result)
+                        return
+                self._send(StubResponse({"message": "404 Not Found"}, status=404))
+
+            def _send(self, response: StubResponse):
+                status = response.status
+                data = json.dumps(response.payload).encode() if status != 204 else b""
+                etag = f'W/"{hashlib.md5(data).hexdigest()}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    stub.not_modified_count += 1
+                    status, data = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if response.status == 200:
+                    self.send_header("ETag", etag)
+                for name, value in response.headers.items():
+                    # Absolute links are advertised relative to the server's real address
+                    self.send_header(name, value.replace("http://stub", stub.url))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
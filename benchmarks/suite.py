@@ -0,0 +1,260 @@
+"""End-to-end benchmark suite: representative workloads through the real FastMCP dispatch.
+
+Every tool call goes through ``mcp.call_tool`` (argument validation, the
+handler, the GitLab client, result serialization) against ``RecordedGitLab``,
+an in-memory GitLab served from the recorded fixtures with configurable
+latency, rate limiting and 503s injected into GETs. Workloads:
+
+- ``tools``: every registered tool once per iteration; also reported per tool
+- ``list_5k_issues``: list all issues of a project with 5000 issues
+- ``triage_200_issues``: list 200 issues, then read, label and comment on each
+
+For each workload the suite reports throughput (tool calls per second), p50
+and p99 call latency and the peak traced memory of one extra, traced
+iteration. Results can be saved with ``--json`` and compared against a saved
+baseline with ``--baseline``, exiting non-zero on a regression beyond
+``--tolerance``.
+
+Usage:
+    python -m benchmarks.suite [--latency 0.01] [--rate-limit 0] [--error-rate 0] [--iterations 5]
+        [--workloads tools list_5k_issues triage_200_issues] [--json results.json]
+        [--baseline baseline.json] [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from benchmarks.common import configure_env, percentile, report
+from benchmarks.recorded_gitlab import RecordedGitLab
+
+
+SMALL_PROJECT = 1  # every tool's target project
+BIG_PROJECT = 2  # 5000 issues
+TRIAGE_PROJECT = 3  # 200+ issues to triage
+TRIAGE_CONCURRENCY = 8
+
+
+class Recorder:
+    """Calls tools through FastMCP and records per-call latency and failures."""
+
+    def __init__(self, mcp):
+        self.mcp = mcp
+        self.samples: dict[str, list[float]] = {}
+        self.errors: list[str] = []
+
+    async def __call__(self, tool: str, arguments: dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await self.mcp.call_tool(tool, arguments)
+        except Exception as exc:
+            self.errors.append(f"{tool}: {exc}")
+            return None
+        finally:
+            self.samples.setdefault(tool, []).append(time.perf_counter() - start)
+        # convert_result returns (content, structured content) for tools with an output schema
+        return result[1] if isinstance(result, tuple) else result
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def latencies(self) -> list[float]:
+        return [sample for samples in self.samples.values() for sample in samples]
+
+
+def tool_sweep(iteration: int) -> dict[str, dict[str, Any]]:
+    """Arguments for one call of every tool; iteration numbers keep created resources apart."""
+    project = SMALL_PROJECT
+    new_iid = 10_000 + iteration
+    return {
+        "gitlab_api_health_check": {},
+        "gitlab_cache_stats": {},
+        "server_metrics": {},
+        "list_projects": {},
+        "get_project_details": {"project_id": project},
+        "list_project_issues": {"project_id": project},
+        "sync_project_issues": {"payload": {"project_id": project}},
+        "get_issue_statistics": {"payload": {"project_id": project}},
+        "count_issues_by_label": {"project_id": project},
+        "aggregate_project_issues": {"payload": {"project_id": project, "group_by": "label"}},
+        "get_issue_details": {"project_id": project, "issue_iid": 1},
+        "get_issue_context": {"payload": {"project_id": project, "issue_iid": 1}},
+        "list_issue_notes": {"payload": {"project_id": project, "issue_iid": 1}},
+        "load_issue_thread": {"payload": {"project_id": project, "issue_iid": 1}},
+        "list_project_merge_requests": {"payload": {"project_id": project}},
+        "search_merge_requests": {"payload": {"project_ids": [1, 2, 3], "state": "opened", "max_items": 20}},
+        "search_issues": {"payload": {"group_id": "acme", "max_items": 20}},
+        "sync_project_merge_requests": {"payload": {"project_id": project}},
+        "aggregate_project_merge_requests": {"payload": {"project_id": project, "group_by": "age"}},
+        "get_single_merge_request": {"payload": {"project_id": project, "merge_request_iid": 1}},
+        "list_project_labels": {"payload": {"project_id": project}},
+        "list_project_repository_branches": {"payload": {"project_id": project}},
+        "list_gitlab_users": {"payload": {}},
+        "find_gitlab_user": {"username": "user42"},
+        "find_gitlab_project": {"path_with_namespace": f"acme/project-{project}"},
+        "create_merge_request": {"payload": {
+            "project_id": project, "source_branch": "feature/branch-1", "target_branch": "main",
+            "title": "Benchmark merge request", "labels": "feature",
+        }},
+        "create_issue": {"payload": {
+            "project_id": project, "title": "Benchmark issue", "labels": "bug", "iid": new_iid,
+        }},
+        "edit_issue": {"payload": {"project_id": project, "issue_iid": new_iid, "add_labels": "triaged"}},
+        "create_issue_note": {"payload": {"project_id": project, "issue_iid": new_iid, "body": "Benchmark note"}},
+        "batch_create_issues": {"payload": {"issues": [
+            {"project_id": project, "title": f"Batch issue {i}", "labels": "bug", "iid": new_iid + 1000 * i}
+            for i in range(1, 6)
+        ]}},
+        "batch_edit_issues": {"payload": {"issues": [
+            {"project_id": project, "issue_iid": new_iid + 1000 * i, "state_event": "close"} for i in range(1, 6)
+        ]}},
+        "delete_issue": {"project_id": project, "issue_iid": new_iid},
+    }
+
+
+async def run_tools(call: Recorder, iteration: int) -> None:
+    for tool, arguments in tool_sweep(iteration).items():
+        await call(tool, arguments)
+
+
+async def run_list_5k_issues(call: Recorder, iteration: int) -> None:
+    await call("list_project_issues", {"project_id": BIG_PROJECT})
+
+
+async def run_triage_200_issues(call: Recorder, iteration: int) -> None:
+    listed = await call("list_project_issues", {"project_id": TRIAGE_PROJECT, "max_items": 200})
+    semaphore = asyncio.Semaphore(TRIAGE_CONCURRENCY)
+
+    async def triage(iid: int) -> None:
+        async with semaphore:
+            await call("get_issue_details", {"project_id": TRIAGE_PROJECT, "issue_iid": iid})
+            await call("list_issue_notes", {"payload": {"project_id": TRIAGE_PROJECT, "issue_iid": iid}})
+            await call("edit_issue", {"payload": {
+                "project_id": TRIAGE_PROJECT, "issue_iid": iid, "add_labels": "triaged", "remove_labels": "needs-info",
+            }})
+            await call("create_issue_note", {"payload": {
+                "project_id": TRIAGE_PROJECT, "issue_iid": iid, "body": f"Triaged in run {iteration}",
+            }})
+
+    await asyncio.gather(*(triage(issue["iid"]) for issue in listed["issues"]))
+
+
+WORKLOADS: dict[str, Callable[[Recorder, int], Awaitable[None]]] = {
+    "tools": run_tools,
+    "list_5k_issues": run_list_5k_issues,
+    "triage_200_issues": run_triage_200_issues,
+}
+
+
+async def run(workloads: list[str], iterations: int) -> dict[str, dict]:
+    from server import mcp
+    from services.cache import response_cache
+    from services.gitlab_api import close_client
+
+    mcp.load_tools()
+    registered = {tool.name for tool in await mcp.list_tools()}
+    missing = registered - tool_sweep(0).keys()
+    if missing:
+        raise SystemExit(f"benchmarks.suite does not cover these tools: {', '.join(sorted(missing))}")
+
+    call = Recorder(mcp)
+    results = {}
+    for name in workloads:
+        workload = WORKLOADS[name]
+        await workload(call, 0)  # warm-up: connections, label index, lazily built validators
+        call.reset()
+        wall = 0.0
+        for iteration in range(1, iterations + 1):
+            response_cache.clear()  # every iteration reads from GitLab
+            start = time.perf_counter()
+            await workload(call, iteration)
+            wall += time.perf_counter() - start
+        latencies = call.latencies()
+        per_tool = {tool: samples[:] for tool, samples in call.samples.items()}
+
+        response_cache.clear()
+        tracemalloc.start()
+        await workload(call, iterations + 1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[name] = {
+            "calls": len(latencies),
+            "throughput": len(latencies) / wall,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "peak_kib": peak / 1024,
+        }
+        print(
+            f"{name:<20} calls={len(latencies):<6} throughput={results[name]['throughput']:9.1f}/s "
+            f"p50={results[name]['p50_ms']:8.3f}ms p99={results[name]['p99_ms']:8.3f}ms "
+            f"peak={results[name]['peak_kib']:9.0f}KiB"
+        )
+        if name == "tools":
+            for tool, samples in sorted(per_tool.items()):
+                report(f"  {tool}", samples)
+        call.reset()
+
+    await close_client()
+    if call.errors:
+        print(f"{len(call.errors)} tool calls failed, e.g. {call.errors[0]}", file=sys.stderr)
+        raise SystemExit(1)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Return a description of every metric that regressed by more than ``tolerance`` against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']:.1f}/s vs {base['throughput']:.1f}/s")
+        for metric in ("p50_ms", "p99_ms", "peak_kib"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]:.1f} vs {base[metric]:.1f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.01, help="Injected server latency in seconds")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second allowed by the stub (0: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of GET requests failed with 503")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    with RecordedGitLab(
+        issue_counts={BIG_PROJECT: 5000, TRIAGE_PROJECT: 250},
+        latency=args.latency,
+        rate_limit=args.rate_limit or None,
+        error_rate=args.error_rate,
+    ) as stub:
+        configure_env(stub.url)
+        if args.rate_limit:
+            os.environ["GITLAB_RATE_LIMIT"] = str(args.rate_limit)
+        results = asyncio.run(run(args.workloads, args.iterations))
+        print(f"requests served: {stub.request_count}, 429s: {stub.throttled_count}, 503s: {stub.error_count}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,104 @@
 import os
+from pathlib import Path
 
 from dotenv import load_dotenv
 
+from config.constants import (
+    MCP_TRANSPORTS,
+    DEFAULT_MCP_HOST,
+    DEFAULT_MCP_PORT,
+    DEFAULT_TOOL_MANIFEST_DIR,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_PAGE_CONCURRENCY,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_BATCH_CONCURRENCY,
+    DEFAULT_FANOUT_CONCURRENCY,
+    DEFAULT_SYNC_MAX_PROJECTS,
+    DEFAULT_MIRROR_PATH,
+    DEFAULT_MIRROR_MAX_AGE,
+    DEFAULT_MIRROR_MAX_ITEMS,
+)
+
 
 load_dotenv()
 
 
+# MCP server transport
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio").lower()
+MCP_HOST = os.getenv("MCP_HOST", DEFAULT_MCP_HOST)
+MCP_PORT = int(os.getenv("MCP_PORT", DEFAULT_MCP_PORT))
+MCP_WORKERS = max(1, int(os.getenv("MCP_WORKERS", 1)))
+MCP_METRICS_PORT = int(os.getenv("MCP_METRICS_PORT", 0))  # 0 disables the /metrics listener
+MCP_TOOL_MANIFEST_DIR = Path(os.getenv("MCP_TOOL_MANIFEST_DIR", DEFAULT_TOOL_MANIFEST_DIR))
+MCP_STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "false").lower() in ("1", "true", "yes") or MCP_WORKERS > 1
+
+if MCP_TRANSPORT not in MCP_TRANSPORTS:
+    raise ValueError(f"MCP_TRANSPORT must be one of: {', '.join(MCP_TRANSPORTS)}.")
+
+if MCP_WORKERS > 1 and MCP_TRANSPORT != "streamable-http":
+    raise ValueError("MCP_WORKERS > 1 requires MCP_TRANSPORT=streamable-http.")
+
+if MCP_WORKERS > 1 and MCP_METRICS_PORT:
+    raise ValueError("MCP_METRICS_PORT cannot be used with MCP_WORKERS > 1, as every worker keeps its own metrics.")
+
 GITLAB_API_PAT = os.getenv("GITLAB_API_PAT")
 GITLAB_URL = os.getenv("GITLAB_URL", "https://gitlab.com").rstrip("/")
 
-if not GITLAB_API_PAT:
+# Over HTTP, clients may send their own token with every request instead
+if not GITLAB_API_PAT and MCP_TRANSPORT == "stdio":
     raise ValueError("GITLAB_API_PAT environment variable is not set.")
 
 if not GITLAB_URL:
     raise ValueError("GITLAB_URL environment variable is not set.")
+
+# HTTP transport
+GITLAB_POOL_SIZE = int(os.getenv("GITLAB_POOL_SIZE", DEFAULT_POOL_SIZE))
+GITLAB_KEEPALIVE_EXPIRY = float(os.getenv("GITLAB_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY))
+GITLAB_CONNECT_TIMEOUT = float(os.getenv("GITLAB_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+GITLAB_READ_TIMEOUT = float(os.getenv("GITLAB_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+GITLAB_HTTP2 = os.getenv("GITLAB_HTTP2", "true").lower() in ("1", "true", "yes")
+
+# Request scheduling
+GITLAB_RATE_LIMIT = max(0.0, float(os.getenv("GITLAB_RATE_LIMIT", DEFAULT_RATE_LIMIT)))
+GITLAB_RATE_BURST = max(1, int(os.getenv("GITLAB_RATE_BURST", DEFAULT_RATE_BURST)))
+GITLAB_MAX_RETRIES = max(0, int(os.getenv("GITLAB_MAX_RETRIES", DEFAULT_MAX_RETRIES)))
+GITLAB_BACKOFF_BASE = float(os.getenv("GITLAB_BACKOFF_BASE", DEFAULT_BACKOFF_BASE))
+GITLAB_BACKOFF_MAX = float(os.getenv("GITLAB_BACKOFF_MAX", DEFAULT_BACKOFF_MAX))
+
+# Pagination
+GITLAB_PAGE_CONCURRENCY = max(1, int(os.getenv("GITLAB_PAGE_CONCURRENCY", DEFAULT_PAGE_CONCURRENCY)))
+
+# Response cache
+GITLAB_CACHE_ENABLED = os.getenv("GITLAB_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GITLAB_CACHE_MAX_ENTRIES = int(os.getenv("GITLAB_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES))
+GITLAB_CACHE_MAX_BYTES = int(os.getenv("GITLAB_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+
+# Batch tools
+GITLAB_BATCH_CONCURRENCY = max(1, int(os.getenv("GITLAB_BATCH_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY)))
+
+# Multi-project search
+GITLAB_FANOUT_CONCURRENCY = max(1, int(os.getenv("GITLAB_FANOUT_CONCURRENCY", DEFAULT_FANOUT_CONCURRENCY)))
+
+# Incremental sync
+GITLAB_SYNC_MAX_PROJECTS = max(1, int(os.getenv("GITLAB_SYNC_MAX_PROJECTS", DEFAULT_SYNC_MAX_PROJECTS)))
+
+# On-disk metadata mirror
+GITLAB_MIRROR_ENABLED = os.getenv("GITLAB_MIRROR_ENABLED", "false").lower() in ("1", "true", "yes")
+GITLAB_MIRROR_PATH = Path(os.getenv("GITLAB_MIRROR_PATH", DEFAULT_MIRROR_PATH))
+GITLAB_MIRROR_MAX_AGE = float(os.getenv("GITLAB_MIRROR_MAX_AGE", DEFAULT_MIRROR_MAX_AGE))
+GITLAB_MIRROR_MAX_ITEMS = max(1, int(os.getenv("GITLAB_MIRROR_MAX_ITEMS", DEFAULT_MIRROR_MAX_ITEMS)))
+
+# Skip URL/datetime re-validation of GitLab responses (see schemas.decoding.trusted_model)
+GITLAB_TRUSTED_RESPONSES = os.getenv("GITLAB_TRUSTED_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Return list tool results as compact tables (see tools.info_tools._compact_result) unless a call sets compact
+GITLAB_COMPACT_OUTPUT = os.getenv("GITLAB_COMPACT_OUTPUT", "false").lower() in ("1", "true", "yes")
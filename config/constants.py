@@ -1 +1,62 @@
 from pathlib import Path
+
+
+# MCP server transport
+MCP_TRANSPORTS = ("stdio", "streamable-http", "sse")
+DEFAULT_MCP_HOST = "127.0.0.1"
+DEFAULT_MCP_PORT = 8000
+GITLAB_TOKEN_HEADER = "X-GitLab-Token"  # per-request PAT sent by MCP clients over HTTP
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "gitlab-mcp"
+DEFAULT_TOOL_MANIFEST_DIR = DEFAULT_CACHE_DIR  # cached tools/list for fast start-up
+
+# HTTP transport defaults (overridable through environment variables, see config.config)
+DEFAULT_POOL_SIZE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection is kept open
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+# Request scheduling (see services.scheduler)
+DEFAULT_RATE_LIMIT = 30.0  # requests per second; GitLab.com allows 2000 per minute per user
+DEFAULT_RATE_BURST = 30
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+DEFAULT_BACKOFF_MAX = 30.0
+RATE_LIMIT_MAX_SCOPES = 1024  # tokens (users) whose rate-limit state is kept
+
+# Pagination
+DEFAULT_PER_PAGE = 100  # GitLab's maximum page size
+DEFAULT_PAGE_CONCURRENCY = 4  # pages prefetched in parallel when X-Total-Pages is known
+
+# Response cache for GET requests
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_TTL = 30.0  # seconds, for endpoints not listed in CACHE_TTLS
+# (endpoint path regex, TTL in seconds); first match wins, a TTL of 0 disables caching
+CACHE_TTLS = (
+    (r"^/version$", 0.0),  # the health check must reach GitLab
+    (r"^/users", 300.0),
+    (r"^/projects/[^/]+/labels", 300.0),
+    (r"^/projects/[^/]+/repository/branches", 60.0),
+    (r"^/projects/[^/]+/issues/\d+/notes", 15.0),
+    (r"^/projects/[^/]+/(issues|merge_requests)", 30.0),
+    (r"^/projects/[^/]+$", 120.0),
+    (r"^/projects$", 120.0),
+)
+
+# Project label index used to validate labels on writes
+LABEL_INDEX_TTL = 300.0  # seconds before a project's labels are reloaded
+LABEL_INDEX_MISS_REFRESH = 10.0  # minimum age before an unknown label triggers a reload
+
+# Batch tools
+DEFAULT_BATCH_CONCURRENCY = 8  # items of a batch tool call executed in parallel
+
+# Multi-project search (see services.fanout)
+DEFAULT_FANOUT_CONCURRENCY = 8  # projects queried in parallel
+
+# Incremental sync of issues and merge requests (see services.sync)
+DEFAULT_SYNC_MAX_PROJECTS = 64  # project mirrors kept in memory, least recently synced dropped first
+
+# On-disk mirror of project, user, label and branch lists (see services.mirror)
+DEFAULT_MIRROR_PATH = DEFAULT_CACHE_DIR / "mirror.sqlite3"
+DEFAULT_MIRROR_MAX_AGE = 600.0  # seconds before a mirrored list is refreshed in the background
+DEFAULT_MIRROR_MAX_ITEMS = 50_000  # items stored per list; longer lists only serve lookups
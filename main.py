@@ -1,10 +1,23 @@
+from config.config import MCP_TRANSPORT, MCP_HOST, MCP_PORT, MCP_WORKERS, MCP_METRICS_PORT
 from server import mcp
-from tools import *
+from services import metrics
+
+
+def create_app():
+    """ASGI app factory for the HTTP transports, loaded by each uvicorn worker process."""
+    return mcp.sse_app() if MCP_TRANSPORT == "sse" else mcp.streamable_http_app()
 
 
 def main():
-    print("Hello from gitlab-mcp!")
-    mcp.run(transport="stdio")
+    if MCP_METRICS_PORT:
+        metrics.serve(MCP_HOST, MCP_METRICS_PORT)
+    if MCP_WORKERS > 1:
+        import uvicorn
+
+        # Every worker imports this module and keeps its own connection pool and cache
+        uvicorn.run("main:create_app", factory=True, host=MCP_HOST, port=MCP_PORT, workers=MCP_WORKERS)
+    else:
+        mcp.run(transport=MCP_TRANSPORT)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ from pydantic import BaseModel, Field, HttpUrl, AnyUrl
 from typing import Optional, List, Dict, Any, Union, Literal, Tuple
 from datetime import datetime
 
+from schemas.info_schemas import Issue
+
 
 class CreateIssueRequest(BaseModel):
     project_id: str | int = Field(..., description="Project ID or URL-encoded path of the project")
@@ -38,6 +40,8 @@ class EditIssueRequest(BaseModel):
     discussion_to_resolve: Optional[str] = None
     due_date: Optional[str] = None  # YYYY-MM-DD
     labels: Optional[str] = None
+    add_labels: Optional[str] = Field(None, description="Comma-separated labels to add to the issue")
+    remove_labels: Optional[str] = Field(None, description="Comma-separated labels to remove from the issue")
     milestone_id: Optional[int] = None
     weight: Optional[int] = None
     assignee_id: Optional[int] = None
@@ -49,6 +53,28 @@ class EditIssueRequest(BaseModel):
     merge_request_to_resolve_discussions_of: Optional[int] = None
 
 
+class BatchCreateIssuesRequest(BaseModel):
+    issues: List[CreateIssueRequest] = Field(..., min_length=1, description="Issues to create")
+
+
+class BatchEditIssuesRequest(BaseModel):
+    issues: List[EditIssueRequest] = Field(..., min_length=1, description="Issue edits to apply")
+
+
+class BatchIssueResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    project_id: str | int
+    success: bool
+    issue: Optional[Issue] = None
+    error: Optional[str] = None
+
+
+class BatchIssueResponse(BaseModel):
+    results: List[BatchIssueResult] = Field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+
+
 class Author(BaseModel):
     id: int
     name: str
@@ -0,0 +1,66 @@
+import types
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, List, Union, get_args, get_origin
+
+from pydantic import AnyUrl, BaseModel, HttpUrl, TypeAdapter, create_model
+
+from config.config import GITLAB_TRUSTED_RESPONSES
+from services.metrics import timed_validation
+
+
+def _relax(annotation: Any) -> Any:
+    """Replace URL and datetime types in ``annotation`` with ``str`` and models with their trusted variant."""
+    if annotation in (HttpUrl, AnyUrl, datetime):
+        return str
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return trusted_model(annotation)
+
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is None or not args:
+        return annotation
+    relaxed = tuple(_relax(arg) for arg in args)
+    if relaxed == args:
+        return annotation
+    if origin in (Union, types.UnionType):
+        return Union[relaxed]
+    return origin[relaxed]
+
+
+@lru_cache(maxsize=None)
+def trusted_model(model: type[BaseModel]) -> type[BaseModel]:
+    """Return a subclass of ``model`` that keeps URLs and timestamps as plain strings.
+
+    GitLab already emits valid URLs and ISO 8601 timestamps, so re-parsing them
+    into ``HttpUrl``/``datetime`` objects is pure overhead for responses we trust.
+    The subclass serializes to the same JSON and is accepted wherever ``model`` is.
+    """
+    overrides = {}
+    for name, field in model.model_fields.items():
+        relaxed = _relax(field.annotation)
+        if relaxed is not field.annotation:
+            overrides[name] = (relaxed, field)
+    if not overrides:
+        return model
+    return create_model(model.__name__, __base__=model, __module__=model.__module__, **overrides)
+
+
+def response_model(model: type[BaseModel]) -> type[BaseModel]:
+    """Return the model to build responses with: the trusted variant when GITLAB_TRUSTED_RESPONSES is set."""
+    return trusted_model(model) if GITLAB_TRUSTED_RESPONSES else model
+
+
+@lru_cache(maxsize=None)
+def list_decoder(model: type[BaseModel]) -> Callable[[bytes], list]:
+    """Return a function validating a raw JSON array body into a list of ``model`` in one pass.
+
+    Validating the bytes directly skips building an intermediate dict tree with
+    ``response.json()`` and constructing each model from keyword arguments.
+    """
+    return timed_validation(TypeAdapter(List[response_model(model)]).validate_json)
+
+
+@lru_cache(maxsize=None)
+def item_validator(model: type[BaseModel]) -> Callable[[Any], BaseModel]:
+    """Return a function validating one already-decoded item into ``model`` (for streamed lists)."""
+    return timed_validation(TypeAdapter(response_model(model)).validate_python)
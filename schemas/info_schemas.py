@@ -1,8 +1,37 @@
-from pydantic import BaseModel, Field, HttpUrl, AnyUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, AnyUrl
 from typing import Optional, List, Dict, Any, Union, Literal, Tuple
 from datetime import datetime
 
 
+def _compact_alternative(schema: Dict[str, Any], model: type[BaseModel]) -> None:
+    """Declare the compact table of a list result as the alternative to its item field."""
+    (items,) = model.model_fields
+    schema["properties"].update(
+        columns={"type": "array", "items": {"type": "string"}, "description": "Compact output: the item fields in use"},
+        rows={
+            "type": "array",
+            "items": {"type": "array"},
+            "description": "Compact output: one row of values per item, in the order of columns; a null or missing trailing value stands for the field's default",
+        },
+    )
+    schema["anyOf"] = [{"required": [items]}, {"required": ["columns", "rows"]}]
+
+
+class ItemList(BaseModel):
+    """Result of a list tool: the items in a single field, or columns and rows when the call sets compact.
+
+    The table exists only in the JSON schema and the structured content (see
+    ``tools.info_tools._compact_result``); the model itself holds the items.
+    """
+    model_config = ConfigDict(json_schema_extra=_compact_alternative)
+
+
+class PaginatedRequest(BaseModel):
+    per_page: int = Field(100, ge=1, le=100, description="Number of results fetched per page")
+    max_items: Optional[int] = Field(None, ge=1, description="Maximum number of results to return across all pages. Returns every result when not set.")
+    compact: Optional[bool] = Field(None, description="Return the items as a table: field names in columns and one row of values per item, with null and default values left out. Defaults to GITLAB_COMPACT_OUTPUT.")
+
+
 class ProjectDetails(BaseModel):
     id: int
     name: Optional[str] = None
@@ -25,7 +54,7 @@ class User(BaseModel):
     web_url: Optional[HttpUrl] = None
 
 
-class ListUsersRequest(BaseModel):
+class ListUsersRequest(PaginatedRequest):
     username: Optional[str] = Field(None, description="Filter by exact username")
     public_email: Optional[str] = Field(None, description="Filter by exact public email")
     search: Optional[str] = Field(None, description="Fuzzy search by name, username, or public email")
@@ -41,11 +70,10 @@ class ListUsersRequest(BaseModel):
     exclude_internal: Optional[bool] = Field(None, description="Exclude internal bot users")
     without_project_bots: Optional[bool] = Field(None, description="Exclude project bot users")
     saml_provider_id: Optional[int] = Field(None, description="Filter by SAML provider ID (deprecated)")
-    page: Optional[int] = Field(None, ge=1, description="Page number for pagination")
-    per_page: Optional[int] = Field(None, ge=1, le=100, description="Number of results per page")
+    page: Optional[int] = Field(None, ge=1, description="Return only this page of results instead of paginating through all of them")
 
 
-class UserList(BaseModel):
+class UserList(ItemList):
     users: List[User] = Field(default_factory=list)
 
 
@@ -144,7 +172,7 @@ class Issue(BaseModel):
         use_enum_values = True
 
 
-class IssueList(BaseModel):
+class IssueList(ItemList):
     issues: List[Issue] = Field(default_factory=list)
 
 
@@ -184,7 +212,7 @@ class Project(BaseModel):
         use_enum_values = True
 
 
-class ProjectList(BaseModel):
+class ProjectList(ItemList):
     projects: List[Project] = Field(default_factory=list)
 
 
@@ -276,14 +304,17 @@ class MergeRequest(BaseModel):
         extra = "allow"
 
 
-class MergeRequestList(BaseModel):
+class MergeRequestList(ItemList):
     merge_requests: List[MergeRequest] = Field(default_factory=list)
 
 
+# Fields returned by the merge request list endpoints with view=simple
+MERGE_REQUEST_SIMPLE_FIELDS = frozenset(
+    {"id", "iid", "project_id", "title", "description", "state", "created_at", "updated_at", "web_url"}
+)
 
-class ListMergeRequestsRequest(BaseModel):
-    project_id: str | int = Field(..., description="Project ID or URL-encoded path of the project")
-    
+
+class MergeRequestFilters(PaginatedRequest):
     # Filter parameters
     approved_by_ids: Optional[List[int]] = Field(None, description="Returns merge requests approved by all the users with the given id, up to 5 users. Premium and Ultimate only.")
     approver_ids: Optional[List[int]] = Field(None, description="Returns merge requests which have specified all the users with the given id as individual approvers. Premium and Ultimate only.")
@@ -314,6 +345,42 @@ class ListMergeRequestsRequest(BaseModel):
     wip: Optional[str] = Field(None, description="Filter merge requests against their wip status. yes to return only draft merge requests, no to return non-draft merge requests.")
     with_labels_details: Optional[bool] = Field(False, description="If true, response returns more details for each label in labels field. Default is false.")
     with_merge_status_recheck: Optional[bool] = Field(False, description="If true, this projection requests an asynchronous recalculation of the merge_status field. Default is false.")
+    fields: Optional[List[str]] = Field(None, description="Return only these MergeRequest fields (e.g. iid, title, state, web_url). Uses view=simple when all of them are part of the simple view.")
+
+
+class ListMergeRequestsRequest(MergeRequestFilters):
+    project_id: str | int = Field(..., description="Project ID or URL-encoded path of the project")
+
+
+class ProjectSet(BaseModel):
+    project_ids: Optional[List[Union[str, int]]] = Field(None, description="Search these projects (IDs or URL-encoded paths). Mutually exclusive with group_id.")
+    group_id: Optional[Union[str, int]] = Field(None, description="Search every project of this group and its subgroups (ID or URL-encoded path).")
+
+
+class SearchMergeRequestsRequest(MergeRequestFilters, ProjectSet):
+    order_by: Optional[Literal["created_at", "updated_at", "title"]] = Field("updated_at", description="Order the merged results by created_at, updated_at or title. Default is updated_at.")
+    sort: Optional[Literal["asc", "desc"]] = Field("desc", description="Sort the merged results in asc or desc order. Default is desc.")
+
+
+class IssueFilters(PaginatedRequest):
+    state: Optional[Literal["opened", "closed", "all"]] = Field(None, description="Return all issues or just those that are opened or closed.")
+    labels: Optional[str] = Field(None, description="Comma-separated list of label names; issues must have all of them. None lists issues with no labels, Any issues with at least one.")
+    milestone: Optional[str] = Field(None, description="Milestone title. None lists issues with no milestone, Any issues with one.")
+    search: Optional[str] = Field(None, description="Search issues against their title and description.")
+    author_username: Optional[str] = Field(None, description="Return issues created by the given username.")
+    assignee_username: Optional[str] = Field(None, description="Return issues assigned to the given username.")
+    confidential: Optional[bool] = Field(None, description="Filter confidential or public issues.")
+    created_after: Optional[str] = Field(None, description="Return issues created on or after the given time (ISO 8601).")
+    created_before: Optional[str] = Field(None, description="Return issues created on or before the given time (ISO 8601).")
+    updated_after: Optional[str] = Field(None, description="Return issues updated on or after the given time (ISO 8601).")
+    updated_before: Optional[str] = Field(None, description="Return issues updated on or before the given time (ISO 8601).")
+    order_by: Optional[Literal["created_at", "updated_at", "title"]] = Field("updated_at", description="Order the results by created_at, updated_at or title. Default is updated_at.")
+    sort: Optional[Literal["asc", "desc"]] = Field("desc", description="Sort the results in asc or desc order. Default is desc.")
+    fields: Optional[List[str]] = Field(None, description="Return only these Issue fields (e.g. iid, title, state, labels).")
+
+
+class SearchIssuesRequest(IssueFilters, ProjectSet):
+    pass
 
 
 class GetMergeRequestRequest(BaseModel):
@@ -349,11 +416,11 @@ class Label(BaseModel):
     archived: Optional[bool] = None
 
 
-class LabelList(BaseModel):
-    labels: List[Label]
+class LabelList(ItemList):
+    labels: List[Label] = Field(default_factory=list)
 
 
-class ListLabelsRequest(BaseModel):
+class ListLabelsRequest(PaginatedRequest):
     project_id: Union[str, int] = Field(description="Project ID or URL-encoded path of the project")
     with_counts: Optional[bool] = Field(False, description="Whether or not to include issue and merge request counts. Defaults to false.")
     include_ancestor_groups: Optional[bool] = Field(True, description="Include ancestor groups. Defaults to true.")
@@ -388,18 +455,13 @@ class BranchInfo(BaseModel):
     web_url: Optional[HttpUrl] = None
     commit: Optional[CommitInfo] = None
 
-class ListBranchesRequest(BaseModel):
+class ListBranchesRequest(PaginatedRequest):
     project_id: Union[str, int] = Field(..., description="Project ID or URL-encoded path of the project")
     regex: Optional[str] = Field(None, description="Return branches matching a re2 regex.")
     search: Optional[str] = Field(None, description="Return branches containing the search string.")
 
-class BranchList(BaseModel):
+class BranchList(ItemList):
     branches: List[BranchInfo] = Field(default_factory=list)
-    project_id: Union[str, int] = Field(description="Project ID or URL-encoded path of the project")
-    with_counts: Optional[bool] = Field(False, description="Whether or not to include issue and merge request counts. Defaults to false.")
-    include_ancestor_groups: Optional[bool] = Field(True, description="Include ancestor groups. Defaults to true.")
-    search: Optional[str] = Field(None, description="Keyword to filter labels by.")
-    archived: Optional[bool] = Field(None, description="Whether the label is archived. Returns all labels, when not set. Requires the labels_archive feature flag to be enabled.")
 
 
 class Note(BaseModel):
@@ -420,7 +482,7 @@ class Note(BaseModel):
     imported_from: Optional[str] = None
 
 
-class NoteList(BaseModel):
+class NoteList(ItemList):
     notes: List[Note] = Field(default_factory=list)
 
 
@@ -434,3 +496,143 @@ class ListIssueNotesRequest(BaseModel):
     order_by: Optional[Literal["created_at", "updated_at"]] = Field(
         None, description="Field used to order notes."
     )
+    all_pages: bool = Field(
+        False, description="Return every note of the issue instead of the first page, oldest first unless sort is set."
+    )
+    compact: Optional[bool] = Field(None, description="Return the items as a table: field names in columns and one row of values per item, with null and default values left out. Defaults to GITLAB_COMPACT_OUTPUT.")
+
+
+class LoadIssueThreadRequest(BaseModel):
+    project_id: Union[str, int] = Field(..., description="Project ID or URL-encoded path of the project")
+    issue_iid: int = Field(..., description="Issue IID")
+    activity_filter: Optional[Literal["all_notes", "only_comments", "only_activity"]] = Field(
+        None, description="Filter notes by activity type."
+    )
+    max_items: Optional[int] = Field(None, ge=1, description="Maximum number of notes to return, oldest first. Returns every note when not set.")
+
+
+class ThreadNote(BaseModel):
+    id: int
+    body: Optional[str] = None
+    author_id: Optional[int] = Field(None, description="ID of the note's author in the thread's authors")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    system: Optional[bool] = None
+    resolvable: Optional[bool] = None
+    confidential: Optional[bool] = None
+    internal: Optional[bool] = None
+
+
+class IssueThread(BaseModel):
+    project_id: Union[str, int]
+    issue_iid: int
+    authors: List[User] = Field(default_factory=list, description="Every author of the thread's notes, once")
+    notes: List[ThreadNote] = Field(default_factory=list)
+
+
+class SyncRequest(BaseModel):
+    project_id: Union[str, int] = Field(..., description="Project ID or URL-encoded path of the project")
+    since: Optional[datetime] = Field(
+        None,
+        description="Return every item updated after this time (ISO 8601, UTC when no offset is given) instead of only those changed since the previous sync.",
+    )
+    full: bool = Field(
+        False, description="List every item again instead of only those updated since the previous sync, e.g. to drop items deleted in GitLab."
+    )
+
+
+class IssueSync(BaseModel):
+    issues: List[Issue] = Field(default_factory=list)
+    watermark: Optional[datetime] = Field(None, description="Most recent updated_at in the local mirror; the next sync fetches only items updated after it.")
+    total: int = Field(0, description="Number of issues in the local mirror")
+    full_sync: bool = Field(False, description="Whether every issue was listed, rather than only the updated ones")
+
+
+class MergeRequestSync(BaseModel):
+    merge_requests: List[MergeRequest] = Field(default_factory=list)
+    watermark: Optional[datetime] = Field(None, description="Most recent updated_at in the local mirror; the next sync fetches only items updated after it.")
+    total: int = Field(0, description="Number of merge requests in the local mirror")
+    full_sync: bool = Field(False, description="Whether every merge request was listed, rather than only the updated ones")
+
+
+class GetIssueContextRequest(BaseModel):
+    project_id: Union[str, int] = Field(..., description="Project ID or full path of the project (e.g. group/project)")
+    issue_iid: int = Field(..., description="Issue IID")
+    notes: int = Field(100, ge=0, le=100, description="Maximum number of notes to return, oldest first")
+    merge_requests: int = Field(20, ge=0, le=100, description="Maximum number of related merge requests to return")
+
+
+class IssueContext(BaseModel):
+    issue: Issue
+    notes: List[Note] = Field(default_factory=list)
+    merge_requests: List[MergeRequest] = Field(default_factory=list, description="Merge requests related to the issue")
+    more_notes: bool = Field(False, description="Whether the issue has more notes than returned; list them with list_issue_notes")
+    more_merge_requests: bool = Field(False, description="Whether more related merge requests exist than returned")
+
+
+class IssueStatisticsRequest(BaseModel):
+    project_id: Optional[Union[str, int]] = Field(None, description="Count the issues of this project (ID or URL-encoded path). Mutually exclusive with group_id.")
+    group_id: Optional[Union[str, int]] = Field(None, description="Count the issues of this group and its subgroups (ID or URL-encoded path). Counts every accessible issue when neither is set.")
+    labels: Optional[str] = Field(None, description="Comma-separated list of label names; issues must have all of them. None counts issues with no labels, Any issues with at least one.")
+    milestone: Optional[str] = Field(None, description="Milestone title. None counts issues with no milestone, Any issues with one.")
+    author_username: Optional[str] = Field(None, description="Count issues created by the given username.")
+    assignee_username: Optional[str] = Field(None, description="Count issues assigned to the given username.")
+    search: Optional[str] = Field(None, description="Count issues matching the search string in their title or description.")
+    confidential: Optional[bool] = Field(None, description="Count only confidential or only public issues.")
+    created_after: Optional[str] = Field(None, description="Count issues created on or after the given time (ISO 8601).")
+    created_before: Optional[str] = Field(None, description="Count issues created on or before the given time (ISO 8601).")
+    updated_after: Optional[str] = Field(None, description="Count issues updated on or after the given time (ISO 8601).")
+    updated_before: Optional[str] = Field(None, description="Count issues updated on or before the given time (ISO 8601).")
+
+
+class IssueStatistics(BaseModel):
+    all: int = 0
+    opened: int = 0
+    closed: int = 0
+
+
+class LabelCount(BaseModel):
+    name: str
+    open_issues: int = 0
+    closed_issues: int = 0
+    open_merge_requests: int = 0
+
+
+class LabelCounts(BaseModel):
+    labels: List[LabelCount] = Field(default_factory=list, description="Labels by descending number of open issues")
+
+
+class MirrorFilters(BaseModel):
+    project_id: Union[str, int] = Field(..., description="Project ID or URL-encoded path of the project")
+    state: Literal["opened", "closed", "merged", "locked", "all"] = Field("opened", description="Aggregate only items in this state (merged and locked apply to merge requests). Default is opened.")
+    labels: Optional[str] = Field(None, description="Comma-separated list of label names; items must have all of them.")
+    milestone: Optional[str] = Field(None, description="Aggregate only items of the milestone with this title.")
+    author_username: Optional[str] = Field(None, description="Aggregate only items created by the given username.")
+    assignee_username: Optional[str] = Field(None, description="Aggregate only items assigned to the given username.")
+
+
+class AggregateIssuesRequest(MirrorFilters):
+    group_by: Literal["label", "assignee", "author", "milestone", "state", "due", "age"] = Field(
+        ..., description="Count issues per label, assignee, author, milestone or state, per due date bucket (how overdue), or per age bucket."
+    )
+
+
+class AggregateMergeRequestsRequest(MirrorFilters):
+    group_by: Literal["label", "assignee", "author", "reviewer", "milestone", "state", "target_branch", "age"] = Field(
+        ..., description="Count merge requests per label, assignee, author, reviewer, milestone, state or target branch, or per age bucket (a histogram)."
+    )
+    age_of: Literal["created_at", "updated_at"] = Field(
+        "created_at", description="Timestamp the age buckets are measured from: created_at (age) or updated_at (time since the last activity)."
+    )
+
+
+class AggregateGroup(BaseModel):
+    key: Optional[str] = Field(None, description="Label, username, milestone, state, branch or bucket; null for items without one (e.g. unassigned)")
+    count: int
+
+
+class Aggregate(BaseModel):
+    group_by: str
+    total: int = Field(0, description="Number of items matching the filters. Items with several labels, assignees or reviewers count towards each of them.")
+    groups: List[AggregateGroup] = Field(default_factory=list)
+    watermark: Optional[datetime] = Field(None, description="Most recent updated_at in the local mirror the counts were computed from")
@@ -1,4 +1,123 @@
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import CallToolResult, ContentBlock, TextContent, Tool as MCPTool
+
+from config.config import MCP_HOST, MCP_PORT, MCP_STATELESS_HTTP, MCP_TOOL_MANIFEST_DIR
+from services import metrics
+
+
+ROOT = Path(__file__).resolve().parent
+# Packages the tool list is generated from; any change to their sources invalidates the manifest
+MANIFEST_SOURCES = ("tools", "schemas", "config")
+
+
+class LazyFastMCP(FastMCP):
+    """FastMCP server that imports its tool modules on first use.
+
+    Importing the tools builds every schema model and tool signature, which
+    dominates start-up. ``tools/list`` is answered from a manifest written by an
+    earlier run for the same tool sources, ``mcp`` and ``pydantic`` versions and
+    Python build; the tool modules are imported on the first tool call, or when
+    no manifest matches.
+    """
+
+    def __init__(self, *args, tool_modules: str, manifest_dir: Path, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tool_modules = tool_modules
+        self.manifest_dir = manifest_dir
+        self._tools_loaded = False
+        self._manifest_path: Optional[Path] = None
+
+    def load_tools(self) -> None:
+        """Import the tool modules, registering their tools, unless already done."""
+        if not self._tools_loaded:
+            importlib.import_module(self.tool_modules)
+            self._tools_loaded = True
+
+    async def list_tools(self) -> list[MCPTool]:
+        if not self._tools_loaded:
+            tools = self._read_manifest()
+            if tools is not None:
+                return tools
+        self.load_tools()
+        tools = await super().list_tools()
+        self._write_manifest(tools)
+        return tools
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Sequence[ContentBlock] | dict[str, Any]:
+        """Call a tool, recording its handler and serialization time separately (see ``services.metrics``)."""
+        self.load_tools()
+        tool = self._tool_manager.get_tool(name)
+        if tool is None:
+            return await super().call_tool(name, arguments)
+
+        with metrics.tool_call(name):
+            result = await tool.run(arguments, context=self.get_context())
+            start = time.perf_counter()
+            try:
+                result = tool.fn_metadata.convert_result(result)
+            except Exception as e:
+                raise ToolError(f"Error executing tool {name}: {e}") from e
+            metrics.TOOL_SERIALIZATION.observe((name,), time.perf_counter() - start)
+            metrics.TOOL_RESPONSE_BYTES.observe((name,), _content_bytes(result))
+        return result
+
+    def manifest_path(self) -> Path:
+        if self._manifest_path is None:
+            # Tool schemas are generated by pydantic, whose output may change with its version or Python's
+            digest = hashlib.sha256(importlib.metadata.version("mcp").encode())
+            digest.update(importlib.metadata.version("pydantic").encode())
+            digest.update(sys.version.encode())
+            for package in MANIFEST_SOURCES:
+                for source in sorted((ROOT / package).glob("*.py")):
+                    digest.update(source.name.encode())
+                    digest.update(source.read_bytes())
+            self._manifest_path = self.manifest_dir / f"tools-{digest.hexdigest()[:16]}.json"
+        return self._manifest_path
+
+    def _read_manifest(self) -> Optional[list[MCPTool]]:
+        try:
+            return [MCPTool.model_validate(tool) for tool in json.loads(self.manifest_path().read_text())]
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, tools: list[MCPTool]) -> None:
+        path = self.manifest_path()
+        if path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_text(json.dumps([tool.model_dump(mode="json", exclude_none=True) for tool in tools]))
+            partial.replace(path)
+        except OSError:
+            pass  # a read-only cache directory only costs the faster start-up
+
+
+def _content_bytes(result: Any) -> int:
+    """UTF-8 size of the text blocks of a converted tool result."""
+    if isinstance(result, tuple):  # (unstructured content, structured content)
+        result = result[0]
+    elif isinstance(result, CallToolResult):
+        result = result.content
+    return sum(len(block.text.encode()) for block in result if isinstance(block, TextContent))
 
 
-mcp = FastMCP(name="GitLab MCP Server")
+mcp = LazyFastMCP(
+    name="GitLab MCP Server",
+    host=MCP_HOST,
+    port=MCP_PORT,
+    stateless_http=MCP_STATELESS_HTTP,
+    tool_modules="tools",
+    manifest_dir=MCP_TOOL_MANIFEST_DIR,
+)
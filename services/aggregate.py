@@ -0,0 +1,98 @@
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, Optional
+
+from services.gitlab_api import split_labels
+from services.sync import parse_timestamp
+
+
+# (upper bound in days, exclusive; bucket name), in display order
+AGE_BUCKETS = ((1, "<1d"), (7, "1-7d"), (30, "7-30d"), (90, "30-90d"), (365, "90-365d"), (None, ">365d"))
+# Days until the due date; negative when overdue
+DUE_BUCKETS = ((-30, "overdue >30d"), (-7, "overdue 8-30d"), (0, "overdue 1-7d"), (8, "due in 0-7d"), (None, "due later"))
+NO_DUE_DATE = "no due date"
+
+
+def _bucket(value: float, buckets: tuple[tuple[Optional[int], str], ...]) -> str:
+    for bound, name in buckets:
+        if bound is None or value < bound:
+            return name
+    raise AssertionError("the last bucket is unbounded")
+
+
+def _usernames(users: Optional[list[dict]]) -> list[Optional[str]]:
+    return [user["username"] for user in users] if users else [None]
+
+
+def _username(user: Optional[dict]) -> Optional[str]:
+    return user["username"] if user else None
+
+
+def group_keys(group_by: str, now: datetime, age_of: str = "created_at") -> Callable[[dict], list[Optional[str]]]:
+    """Return a function mapping an issue or merge request to the groups it counts towards.
+
+    Items without a value (no label, assignee, milestone or due date) count
+    towards a ``None`` group; items with several labels, assignees or reviewers
+    count towards each of them.
+    """
+    if group_by == "label":
+        return lambda item: item.get("labels") or [None]
+    if group_by == "assignee":
+        return lambda item: _usernames(item.get("assignees"))
+    if group_by == "reviewer":
+        return lambda item: _usernames(item.get("reviewers"))
+    if group_by == "author":
+        return lambda item: [_username(item.get("author"))]
+    if group_by == "milestone":
+        return lambda item: [(item.get("milestone") or {}).get("title")]
+    if group_by in ("state", "target_branch"):
+        return lambda item: [item.get(group_by)]
+    if group_by == "age":
+        return lambda item: [_bucket((now - parse_timestamp(item[age_of])).total_seconds() / 86400, AGE_BUCKETS)]
+    if group_by == "due":
+        today = now.date()
+        return lambda item: [
+            _bucket((date.fromisoformat(item["due_date"][:10]) - today).days, DUE_BUCKETS) if item.get("due_date")
+            else NO_DUE_DATE
+        ]
+    raise ValueError(f"Cannot group by {group_by}.")
+
+
+def matches(
+    item: dict,
+    labels: Optional[str] = None,
+    author_username: Optional[str] = None,
+    assignee_username: Optional[str] = None,
+    milestone: Optional[str] = None,
+) -> bool:
+    """Apply GitLab's list filters of the same names to a mirrored item (labels: all of a comma-separated list)."""
+    if labels and not set(split_labels(labels)) <= set(item.get("labels") or ()):
+        return False
+    if author_username and _username(item.get("author")) != author_username:
+        return False
+    if assignee_username and assignee_username not in _usernames(item.get("assignees")):
+        return False
+    if milestone and (item.get("milestone") or {}).get("title") != milestone:
+        return False
+    return True
+
+
+def aggregate(
+    items: Iterable[dict], group_by: str, now: Optional[datetime] = None, age_of: str = "created_at"
+) -> tuple[int, list[tuple[Optional[str], int]]]:
+    """Count ``items`` per group; return the number of items and the (group, count) pairs.
+
+    Age and due date groups come in bucket order with empty buckets included,
+    so they read as a histogram; other groups come by descending count.
+    """
+    keys = group_keys(group_by, now or datetime.now(timezone.utc), age_of)
+    counts: Counter = Counter()
+    total = 0
+    for item in items:
+        total += 1
+        counts.update(keys(item))
+    if group_by == "age":
+        return total, [(name, counts[name]) for _, name in AGE_BUCKETS]
+    if group_by == "due":
+        return total, [(name, counts[name]) for _, name in DUE_BUCKETS] + [(NO_DUE_DATE, counts[NO_DUE_DATE])]
+    return total, sorted(counts.items(), key=lambda group: (-group[1], group[0] is None, group[0] or ""))
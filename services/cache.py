@@ -0,0 +1,212 @@
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import httpx
+from config.config import (
+    GITLAB_CACHE_ENABLED,
+    GITLAB_CACHE_MAX_ENTRIES,
+    GITLAB_CACHE_MAX_BYTES,
+)
+from config.constants import CACHE_TTLS, DEFAULT_CACHE_TTL
+
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...], str]
+
+_PROJECT = r"(?P<project>[^/]+)"
+_ISSUE = rf"^/projects/{_PROJECT}/issues/(?P<iid>\d+)"
+
+# Dependency map from mutating endpoints to the cached reads they make stale:
+# (HTTP method, endpoint path regex, read path regex templates). Templates are
+# formatted with the named groups of the write's match. Lists that merely show
+# a counter affected by the write (e.g. user_notes_count) are left to expire.
+# Group and instance-wide lists (search_issues, search_merge_requests) and issue
+# statistics may include any project's items, so every write of an issue or
+# merge request drops them.
+_ISSUE_LISTS = (
+    r"^/projects/{project}/issues(_statistics)?$",
+    r"^(/groups/[^/]+)?/issues(_statistics)?$",
+)
+_MERGE_REQUEST_LISTS = (r"^/projects/{project}/merge_requests$", r"^(/groups/[^/]+)?/merge_requests$")
+INVALIDATION_RULES = (
+    ("POST", rf"^/projects/{_PROJECT}/issues$", _ISSUE_LISTS),
+    ("PUT", rf"{_ISSUE}$", (*_ISSUE_LISTS, r"^/projects/{project}/issues/{iid}$")),
+    ("DELETE", rf"{_ISSUE}$", (*_ISSUE_LISTS, r"^/projects/{project}/issues/{iid}(/|$)")),
+    ("POST", rf"{_ISSUE}/notes$", (r"^/projects/{project}/issues/{iid}(/notes)?$",)),
+    ("POST", rf"^/projects/{_PROJECT}/merge_requests$", _MERGE_REQUEST_LISTS),
+)
+
+
+@dataclass
+class CacheEntry:
+    response: httpx.Response
+    etag: Optional[str]
+    expires_at: float
+    size: int
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """Bounded in-process cache of successful GitLab GET responses.
+
+    Entries are keyed on endpoint path, query parameters and a digest of the
+    token that fetched them, expire after a per-endpoint TTL, and are evicted in
+    least-recently-used order once either the entry count or the total body size
+    exceeds its limit. Expired entries that carry an ``ETag`` are kept so that
+    they can be revalidated with ``If-None-Match`` instead of re-downloaded.
+
+    Paths with a GET in flight carry a generation that every invalidation of
+    the path advances, so a response requested before a write is neither
+    cached nor shared with readers that arrive after it (see ``reading``).
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttls: tuple[tuple[str, float], ...], default_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self._rules = [(method, re.compile(pattern), templates) for method, pattern, templates in INVALIDATION_RULES]
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        # endpoint path -> [GETs in flight, generation]; a path is tracked only while read
+        self._reads: dict[str, list[int]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, path: str) -> float:
+        """Return the TTL in seconds for an endpoint path (e.g. '/projects/1/labels')."""
+        for pattern, ttl in self._ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the entry for ``key``, fresh or revalidatable, counting a hit or a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and not entry.fresh and entry.etag is None:
+            self._remove(key)
+            entry = None
+
+        if entry is not None and entry.fresh:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def store(self, key: CacheKey, response: httpx.Response, ttl: float, revalidate: bool = True) -> None:
+        """Cache a successful response for ``ttl`` seconds.
+
+        With ``revalidate=False`` the response's ``ETag`` is not kept, e.g. when the
+        body comes from a write whose ETag does not describe the GET representation.
+        """
+        if ttl <= 0:
+            return
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        etag = response.headers.get("ETag") if revalidate else None
+        self._entries[key] = CacheEntry(response, etag, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def refresh(self, key: CacheKey, entry: CacheEntry, ttl: float) -> None:
+        """Extend the lifetime of ``entry`` after a ``304 Not Modified`` revalidation.
+
+        The entry may have been evicted, invalidated or cleared while the
+        revalidating request was in flight; its response is then stored again.
+        """
+        self.revalidations += 1
+        if self._entries.get(key) is not entry:
+            self.store(key, entry.response, ttl, revalidate=entry.etag is not None)
+            return
+        entry.expires_at = time.monotonic() + ttl
+        self._entries.move_to_end(key)
+
+    @contextmanager
+    def reading(self, path: str) -> Iterator[int]:
+        """Track a GET of ``path`` as in flight and yield the path's current generation.
+
+        Compare it with ``generation(path)`` once the response arrives: a
+        different value means the path was invalidated in the meantime and the
+        response may predate the write.
+        """
+        state = self._reads.setdefault(path, [0, self._generation])
+        state[0] += 1
+        try:
+            yield state[1]
+        finally:
+            state[0] -= 1
+            if not state[0]:
+                del self._reads[path]
+
+    def generation(self, path: str) -> int:
+        """Return the generation of ``path``; paths without a GET in flight are at the latest generation."""
+        state = self._reads.get(path)
+        return state[1] if state else self._generation
+
+    def invalidate(self, path_pattern: str) -> int:
+        """Drop every entry whose endpoint path matches ``path_pattern``; return how many were dropped.
+
+        Paths matching the pattern that are being read move to a new generation.
+        """
+        pattern = re.compile(path_pattern)
+        self._generation += 1
+        for path, state in self._reads.items():
+            if pattern.search(path):
+                state[1] = self._generation
+        stale = [key for key in self._entries if pattern.search(key[0])]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def invalidate_for_write(self, method: str, path: str) -> None:
+        """Drop the cached reads that a successful ``method`` request to ``path`` made stale."""
+        for rule_method, pattern, templates in self._rules:
+            match = pattern.search(path) if rule_method == method else None
+            if match:
+                groups = {name: re.escape(value) for name, value in match.groupdict().items()}
+                for template in templates:
+                    self.invalidate(template.format(**groups))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._generation += 1
+        for state in self._reads.values():
+            state[1] = self._generation
+
+    def stats(self) -> dict:
+        return {
+            "enabled": GITLAB_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+response_cache = ResponseCache(GITLAB_CACHE_MAX_ENTRIES, GITLAB_CACHE_MAX_BYTES, CACHE_TTLS, DEFAULT_CACHE_TTL)
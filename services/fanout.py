@@ -0,0 +1,107 @@
+import heapq
+from collections import deque
+from typing import AsyncIterator, Optional, Union
+
+from config.config import GITLAB_FANOUT_CONCURRENCY
+from services.gitlab_api import gather_limited, paginate
+
+
+class _Descending:
+    """Sort key wrapper inverting the order of ``value``, for a descending merge on a min-heap."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def project_set_endpoints(
+    kind: str, project_ids: Optional[list[Union[str, int]]], group_id: Optional[Union[str, int]]
+) -> list[tuple[str, dict]]:
+    """Return the list endpoints of ``kind`` ('issues' or 'merge_requests') covering a project set.
+
+    A group or "all accessible projects" is covered by GitLab's group or
+    instance-level endpoint in a single list, so only an explicit set of
+    projects fans out to one list per project. Each endpoint comes with the
+    default query parameters it needs, which the caller's filters override.
+    """
+    if project_ids and group_id is not None:
+        raise ValueError("Pass either project_ids or group_id, not both.")
+    if project_ids:
+        return [(f"/projects/{project_id}/{kind}", {}) for project_id in dict.fromkeys(map(str, project_ids))]
+    if group_id is not None:
+        return [(f"/groups/{group_id}/{kind}", {})]
+    # The instance-level lists default to the caller's own items
+    return [(f"/{kind}", {"scope": "all"})]
+
+
+async def merge_sorted(
+    endpoints: list[tuple[str, dict]],
+    params: dict,
+    order_by: str,
+    descending: bool,
+    per_page: int,
+    max_items: Optional[int] = None,
+    concurrency: int = GITLAB_FANOUT_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """Yield the items of several GitLab lists as one list sorted by ``order_by``.
+
+    Every list is requested already sorted by ``order_by``, and the lists are
+    combined with a k-way merge: the first pages of all lists are fetched with
+    up to ``concurrency`` requests in flight, and a list's next page is fetched
+    only once the merge has consumed its current one. Each list is read up to
+    ``max_items`` items at most, since no more of its items can make the top
+    ``max_items``, and fetching stops as soon as ``max_items`` items have been
+    yielded or the caller stops iterating. GitLab renders timestamps in UTC in a
+    fixed format, so they are compared as strings.
+
+    Args:
+        endpoints (list): (endpoint, default query parameters) pairs, e.g. from ``project_set_endpoints``.
+        params (dict): Filters sent to every endpoint, taking precedence over the endpoint's defaults.
+        order_by (str): Item field the lists are sorted and merged on, e.g. 'updated_at'.
+        descending (bool): Merge in descending order.
+        per_page (int): Page size requested from GitLab (max 100).
+        max_items (int, optional): Stop after this many items. Reads every list completely when not set.
+        concurrency (int): Maximum number of first pages fetched in parallel.
+    """
+    query = {**params, "order_by": order_by, "sort": "desc" if descending else "asc"}
+    page_size = min(per_page, max_items) if max_items else per_page
+    sources = [
+        paginate(endpoint, {**defaults, **query}, per_page=page_size, max_items=max_items, concurrency=1)
+        for endpoint, defaults in endpoints
+    ]
+    buffers: list[deque] = [deque() for _ in sources]
+    heap: list[tuple] = []
+
+    def push(index: int) -> None:
+        value = buffers[index][0].get(order_by) or ""
+        heapq.heappush(heap, (_Descending(value) if descending else value, index))
+
+    try:
+        first_pages = await gather_limited((anext(source, []) for source in sources), concurrency)
+        for index, page in enumerate(first_pages):
+            if isinstance(page, BaseException):
+                raise page
+            if page:
+                buffers[index].extend(page)
+                push(index)
+
+        remaining = max_items
+        while heap and remaining != 0:
+            _, index = heapq.heappop(heap)
+            yield buffers[index].popleft()
+            if remaining is not None:
+                remaining -= 1
+            if not buffers[index]:
+                buffers[index].extend(await anext(sources[index], []))
+            if buffers[index]:
+                push(index)
+    finally:
+        for source in sources:
+            await source.aclose()
@@ -1,41 +1,251 @@
-from typing import Optional, Literal
+import asyncio
+import hashlib
+import importlib.util
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Literal
 
-import requests
-from config.config import GITLAB_URL, GITLAB_API_PAT
+import httpx
+from mcp.server.lowlevel.server import request_ctx
+from config.config import (
+    GITLAB_URL,
+    GITLAB_API_PAT,
+    GITLAB_POOL_SIZE,
+    GITLAB_KEEPALIVE_EXPIRY,
+    GITLAB_CONNECT_TIMEOUT,
+    GITLAB_READ_TIMEOUT,
+    GITLAB_HTTP2,
+    GITLAB_PAGE_CONCURRENCY,
+    GITLAB_CACHE_ENABLED,
+)
+from config.constants import GITLAB_TOKEN_HEADER, DEFAULT_PER_PAGE, LABEL_INDEX_TTL, LABEL_INDEX_MISS_REFRESH
+from services import metrics
+from services.cache import CacheEntry, CacheKey, response_cache
+from services.json_stream import iter_json_array
+from services.scheduler import scheduler
 
 
-def gitlab_request(method: Literal['GET', 'POST', 'PUT', 'DELETE'], endpoint: str, params: Optional[dict] = None) -> dict:
-    """Helper function to perform requests to the GitLab API.
-    
-    Args:
-        method (str): HTTP method ('GET', 'POST', 'PUT', or 'DELETE').
-        endpoint (str): API endpoint (e.g., '/projects').
-        params (dict, optional): Parameters to include in the request.
-    
-    Returns:
-        dict: JSON response from the API.
+_client: Optional[httpx.AsyncClient] = None
 
-    Raises:
-        requests.HTTPError: If the HTTP request returned an unsuccessful status code.
-        ValueError: If invalid HTTP method is provided.
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared, connection-pooled HTTP client for the GitLab API.
+
+    The client is created on first use and reused by every tool, and by every
+    MCP client of an HTTP server, so that TCP/TLS connections are kept alive
+    between calls. HTTP/2 is negotiated when enabled and the optional ``h2``
+    package is installed. The client carries no credentials; each request is
+    authenticated with ``auth_headers()``.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=f"{GITLAB_URL}/api/v4/",
+            limits=httpx.Limits(
+                max_connections=GITLAB_POOL_SIZE,
+                max_keepalive_connections=GITLAB_POOL_SIZE,
+                keepalive_expiry=GITLAB_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(GITLAB_READ_TIMEOUT, connect=GITLAB_CONNECT_TIMEOUT),
+            http2=GITLAB_HTTP2 and importlib.util.find_spec("h2") is not None,
+        )
+    return _client
+
+
+def request_token() -> str:
+    """Return the GitLab PAT for the current tool call.
+
+    Over the HTTP transports an MCP client may send its own PAT in the
+    ``X-GitLab-Token`` header, so that users sharing a server act as
+    themselves; otherwise ``GITLAB_API_PAT`` is used.
+    """
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        request = None
+    token = request.headers.get(GITLAB_TOKEN_HEADER) if request is not None else None
+    token = token or GITLAB_API_PAT
+    if not token:
+        raise ValueError(f"No GitLab token: send the {GITLAB_TOKEN_HEADER} header or set GITLAB_API_PAT.")
+    return token
+
+
+def token_scope() -> str:
+    """Return a digest of the current token, to key per-user state without keeping the token itself."""
+    return _token_digest(request_token())
+
+
+def auth_headers() -> dict[str, str]:
+    return {"Authorization": f"Bearer {request_token()}"}
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _send(
+    method: Literal['GET', 'POST', 'PUT', 'DELETE'], endpoint: str, params: Optional[dict] = None, use_cache: bool = True
+) -> httpx.Response:
+    """Send a request on the shared client and return the raw, successful response.
+
+    ``endpoint`` is either an API path (e.g. '/projects') or an absolute URL of a
+    following page (see ``_next_page_url``), in which case it already carries its
+    query string.
+    GETs are served from the response cache unless ``use_cache`` is false, in
+    which case the fresh response still replaces the cached one, and identical
+    concurrent GETs share a single upstream request. Requests that reach GitLab
+    go through the rate-limiting, retrying ``scheduler``.
     """
-    url = f"{GITLAB_URL}/api/v4/{endpoint.lstrip('/')}"
-    headers = {"Authorization": f"Bearer {GITLAB_API_PAT}"}
+    client = get_client()
+    url = _url(endpoint)
+    headers = auth_headers()
 
     match method:
         case "GET":
-            response = requests.get(url, headers=headers, params=params)
-        case "POST":
-            response = requests.post(url, headers=headers, json=params)
-        case "PUT":
-            response = requests.put(url, headers=headers, json=params)
+            return await _get(client, client.build_request("GET", url, params=params, headers=headers), use_cache)
+        case "POST" | "PUT":
+            request = client.build_request(method, url, json=params, headers=headers)
         case "DELETE":
-            response = requests.delete(url, headers=headers, params=params)
+            request = client.build_request("DELETE", url, params=params, headers=headers)
         case _:
             raise ValueError("Invalid HTTP method")
 
+    response = await scheduler.send(
+        method, lambda: client.send(request), endpoint=_endpoint_label(request), scope=token_scope()
+    )
     response.raise_for_status()
+    # Also with the cache disabled: it moves GETs in flight to a new generation.
+    response_cache.invalidate_for_write(method, _endpoint_path(response.request.url))
+    return response
+
+
+def _url(endpoint: str) -> str:
+    """Return ``endpoint`` relative to the client's base URL, leaving absolute (next page) URLs untouched."""
+    return endpoint if endpoint.startswith(("http://", "https://")) else endpoint.lstrip('/')
+
+
+def _endpoint_path(url: httpx.URL) -> str:
+    """Return the API path of ``url`` relative to the '/api/v4' prefix (e.g. '/projects/1').
+
+    The path is kept percent-encoded, so a project given by its URL-encoded
+    path ('/projects/acme%2Fwidgets/issues') stays a single path segment, as
+    the cache TTL and invalidation patterns expect.
+    """
+    prefix = get_client().base_url.raw_path.decode("ascii").rstrip('/')
+    path = url.raw_path.decode("ascii").partition('?')[0]
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def _endpoint_label(request: httpx.Request) -> str:
+    return metrics.endpoint_label(_endpoint_path(request.url))
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _cache_key(request: httpx.Request) -> CacheKey:
+    return (
+        _endpoint_path(request.url),
+        tuple(sorted(request.url.params.multi_items())),
+        _token_digest(request.headers.get("Authorization", "")),
+    )
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers asking for the same key.
 
+    The first caller starts the call as a task; callers arriving before it
+    completes await the same task instead of starting their own, and
+    ``coalesced`` counts them. Cancelling a caller does not cancel the shared
+    call, which may still be awaited by others.
+    """
+
+    def __init__(self):
+        self._calls: dict[Any, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _land(self, key: Any, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()  # retrieved here in case every caller was cancelled
+
+
+single_flight = SingleFlight()
+
+
+async def _get(client: httpx.AsyncClient, request: httpx.Request, use_cache: bool = True) -> httpx.Response:
+    """Serve a GET from the response cache, or share the upstream request of an identical in-flight GET.
+
+    Stale cache entries are revalidated with their ETag. In-flight GETs are
+    shared per path generation, so a caller arriving after a write to the path
+    does not join a request sent before it.
+    """
+    key = _cache_key(request)
+    entry = None
+    if GITLAB_CACHE_ENABLED:
+        entry = response_cache.lookup(key) if use_cache else None
+        if entry is not None and entry.fresh:
+            metrics.CACHE_HITS.inc((metrics.endpoint_label(key[0]),))
+            return entry.response
+    with response_cache.reading(key[0]) as generation:
+        return await single_flight.do((key, generation), lambda: _fetch(client, request, key, entry, generation))
+
+
+async def _fetch(
+    client: httpx.AsyncClient, request: httpx.Request, key: CacheKey, entry: Optional[CacheEntry], generation: int
+) -> httpx.Response:
+    if entry is not None:
+        request.headers["If-None-Match"] = entry.etag
+
+    response = await scheduler.send(
+        "GET", lambda: client.send(request), endpoint=metrics.endpoint_label(key[0]), scope=token_scope()
+    )
+    # A write invalidated the path while the request was in flight: the response may predate it.
+    current = response_cache.generation(key[0]) == generation
+    ttl = response_cache.ttl_for(key[0])
+    if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+        if current:
+            response_cache.refresh(key, entry, ttl)
+        return entry.response
+
+    response.raise_for_status()
+    if GITLAB_CACHE_ENABLED and current:
+        response_cache.store(key, response, ttl)
+    return response
+
+
+def prime_cache(endpoint: str, data: Any) -> None:
+    """Write-through: cache ``data`` as the current GET response of ``endpoint``.
+
+    Used after writes whose response body is the new representation of a
+    resource (e.g. the issue returned by an edit), so the next read is served
+    fresh from the cache instead of going back to GitLab.
+    """
+    if not GITLAB_CACHE_ENABLED:
+        return
+    request = get_client().build_request("GET", endpoint.lstrip('/'), headers=auth_headers())
+    key = _cache_key(request)
+    response = httpx.Response(httpx.codes.OK, json=data, request=request)
+    response_cache.store(key, response, response_cache.ttl_for(key[0]), revalidate=False)
+
+
+def _parse(response: httpx.Response) -> Any:
     # Handle empty responses (common with DELETE requests)
     if not response.content:
         return {}
@@ -46,11 +256,377 @@ def gitlab_request(method: Literal['GET', 'POST', 'PUT', 'DELETE'], endpoint: st
         return {"error": "Invalid JSON response"}
 
 
-def validate_labels(project_id, labels) -> None:
+async def gitlab_request(
+    method: Literal['GET', 'POST', 'PUT', 'DELETE'],
+    endpoint: str,
+    params: Optional[dict] = None,
+    decode: Optional[Callable[[bytes], Any]] = None,
+) -> dict:
+    """Helper function to perform requests to the GitLab API.
+
+    The request is awaited on the shared async client, so concurrent tool calls
+    overlap their network waits instead of blocking the event loop.
+
+    Args:
+        method (str): HTTP method ('GET', 'POST', 'PUT', or 'DELETE').
+        endpoint (str): API endpoint (e.g., '/projects').
+        params (dict, optional): Parameters to include in the request.
+        decode (callable, optional): Turns the raw response body into the return value,
+            e.g. a pydantic validator; the body is parsed with ``response.json()`` when not set.
+
+    Returns:
+        dict: JSON response from the API.
+
+    Raises:
+        httpx.HTTPStatusError: If the HTTP request returned an unsuccessful status code.
+        ValueError: If invalid HTTP method is provided.
+    """
+    return _decode_page(await _send(method, endpoint, params), decode)
+
+
+async def graphql_request(query: str, variables: Optional[dict] = None) -> dict:
+    """Run a GraphQL query against GitLab's ``/api/graphql`` endpoint.
+
+    One query can fetch several related entities that would each take a REST
+    round trip. Queries are scheduled and retried like GETs; their responses
+    are not cached.
+
+    Args:
+        query (str): GraphQL query document.
+        variables (dict, optional): Values of the query's variables.
+
+    Returns:
+        dict: The ``data`` member of the response.
+
+    Raises:
+        httpx.HTTPStatusError: If the HTTP request returned an unsuccessful status code.
+        ValueError: If GitLab reports errors for the query.
+    """
+    client = get_client()
+    request = client.build_request(
+        "POST", f"{GITLAB_URL}/api/graphql", json={"query": query, "variables": variables or {}}, headers=auth_headers(),
+    )
+    response = await scheduler.send(
+        "POST", lambda: client.send(request), endpoint="/graphql", read=True, scope=token_scope()
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("errors"):
+        raise ValueError(f"GitLab GraphQL error: {'; '.join(error.get('message', str(error)) for error in body['errors'])}")
+    return body["data"]
+
+
+def _decode_page(response: httpx.Response, decode: Optional[Callable[[bytes], Any]]) -> Any:
+    if decode is None or not response.content:
+        return _parse(response)
+    return decode(response.content)
+
+
+def _next_page_url(response: httpx.Response) -> Optional[str]:
+    """Return the absolute URL of the page following ``response``, if any, on the client's base URL.
+
+    Keyset-paginated responses only advertise the next page through the ``Link``
+    header; offset-paginated ones also set ``X-Next-Page``.
+    """
+    next_link = response.links.get("next", {}).get("url")
+    if next_link:
+        return str(_on_base_url(httpx.URL(next_link)))
+
+    next_page = response.headers.get("X-Next-Page")
+    if next_page:
+        return str(response.url.copy_set_param("page", next_page))
+
+    return None
+
+
+def _on_base_url(url: httpx.URL) -> httpx.URL:
+    """Move an API ``url`` onto the client's base URL, keeping only its path below '/api/v4/' and its query.
+
+    GitLab builds ``Link`` URLs from the scheme and host it believes it is served
+    at, which behind a TLS-terminating proxy or with another ``external_url`` is
+    not GITLAB_URL; requesting them as is would send the token to that origin.
+    """
+    _, found, endpoint = url.raw_path.decode("ascii").partition("/api/v4/")
+    if not found:
+        raise ValueError(f"GitLab returned a pagination link outside its API: {url}")
+    return get_client().base_url.join(endpoint)
+
+
+def _first_page_query(params: Optional[dict], per_page: int, max_items: Optional[int], keyset: bool) -> dict:
+    query = dict(params or {})
+    query["per_page"] = min(per_page, max_items) if max_items else per_page
+    if keyset:
+        query.setdefault("pagination", "keyset")
+        query.setdefault("order_by", "id")
+        query.setdefault("sort", "asc")
+    return query
+
+
+async def paginate(
+    endpoint: str,
+    params: Optional[dict] = None,
+    per_page: int = DEFAULT_PER_PAGE,
+    max_items: Optional[int] = None,
+    keyset: bool = False,
+    concurrency: int = GITLAB_PAGE_CONCURRENCY,
+    use_cache: bool = True,
+    decode: Optional[Callable[[bytes], list]] = None,
+) -> AsyncIterator[list]:
+    """Iterate over the pages of a GitLab list endpoint.
+
+    Pages are fetched lazily so callers can process large result sets
+    incrementally and stop early without downloading the rest. When the first
+    response advertises ``X-Total-Pages``, the remaining pages are prefetched
+    with up to ``concurrency`` requests in flight and still yielded in order.
+
+    Args:
+        endpoint (str): API endpoint (e.g., '/projects').
+        params (dict, optional): Query parameters for the first page.
+        per_page (int): Page size requested from GitLab (max 100).
+        max_items (int, optional): Stop after this many items. Fetches every page when not set.
+        keyset (bool): Use keyset pagination (``pagination=keyset``, ordered by id). Only
+            some endpoints support it, e.g. '/projects' and '/users'; it avoids the
+            deep-offset cost of walking thousands of pages.
+        concurrency (int): Maximum number of pages fetched in parallel (1 disables prefetching).
+        use_cache (bool): Serve pages from the response cache when fresh entries exist.
+        decode (callable, optional): Turns a raw page body into a list, e.g. a pydantic
+            list validator (see ``schemas.decoding.list_decoder``). Pages are parsed
+            into lists of dicts when not set.
+
+    Yields:
+        list: The items of each page, truncated so that at most ``max_items`` are yielded.
+    """
+    query = _first_page_query(params, per_page, max_items, keyset)
+    remaining = max_items
+    next_endpoint: Optional[str] = endpoint
+    while next_endpoint:
+        response = await _send("GET", next_endpoint, query, use_cache)
+        query = None  # subsequent page URLs carry their own query string
+        page = _decode_page(response, decode)
+        if not isinstance(page, list) or not page:
+            return
+
+        if remaining is not None:
+            page = page[:remaining]
+            remaining -= len(page)
+        yield page
+
+        if remaining == 0:
+            return
+
+        total_pages = response.headers.get("X-Total-Pages")
+        if concurrency > 1 and total_pages and not keyset:
+            current_page = int(response.headers.get("X-Page", 1))
+            last_page = int(total_pages)
+            if remaining is not None:
+                page_size = int(response.headers.get("X-Per-Page", per_page))
+                last_page = min(last_page, current_page + -(-remaining // page_size))
+            pages = range(current_page + 1, last_page + 1)
+            async for page in _prefetch_pages(response.url, pages, concurrency, remaining, use_cache, decode):
+                yield page
+            return
+
+        next_endpoint = _next_page_url(response)
+
+
+async def _prefetch_pages(
+    url: httpx.URL,
+    pages: range,
+    concurrency: int,
+    remaining: Optional[int],
+    use_cache: bool,
+    decode: Optional[Callable[[bytes], list]],
+) -> AsyncIterator[list]:
+    """Fetch ``pages`` of the list at ``url`` with a sliding window of requests.
+
+    At most ``concurrency`` pages are in flight or buffered at any time, and pages
+    are yielded in page order regardless of the order in which they complete.
+    """
+    page_numbers = iter(pages)
+    window: deque[asyncio.Task] = deque()
+
+    def schedule() -> None:
+        page_number = next(page_numbers, None)
+        if page_number is not None:
+            page_url = str(url.copy_set_param("page", page_number))
+            window.append(asyncio.ensure_future(_send("GET", page_url, use_cache=use_cache)))
+
+    try:
+        for _ in range(concurrency):
+            schedule()
+        while window:
+            page = _decode_page(await window.popleft(), decode)
+            schedule()
+            if not isinstance(page, list) or not page:
+                return
+
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+            yield page
+
+            if remaining == 0:
+                return
+    finally:
+        for task in window:
+            task.cancel()
+
+
+async def stream_items(
+    endpoint: str,
+    params: Optional[dict] = None,
+    per_page: int = DEFAULT_PER_PAGE,
+    max_items: Optional[int] = None,
+    keyset: bool = False,
+    validate: Optional[Callable[[Any], Any]] = None,
+) -> AsyncIterator[Any]:
+    """Iterate over the items of a GitLab list endpoint one at a time.
+
+    Each page body is decoded incrementally as it arrives, so neither the raw
+    body nor the parsed page is ever held in memory in full and peak memory is
+    bounded by the page size rather than the response size. Pages are fetched
+    sequentially and bypass the response cache, since their bodies are never
+    retained. Stopping early closes the in-flight response without reading the
+    rest of it.
+
+    Args:
+        endpoint (str): API endpoint (e.g., '/users').
+        params (dict, optional): Query parameters for the first page.
+        per_page (int): Page size requested from GitLab (max 100).
+        max_items (int, optional): Stop after this many items. Streams every page when not set.
+        keyset (bool): Use keyset pagination (see ``paginate``).
+        validate (callable, optional): Applied to each decoded item, e.g. a model validator
+            (see ``schemas.decoding.item_validator``).
+
+    Yields:
+        Each item, validated when ``validate`` is set.
+    """
+    client = get_client()
+    query: Optional[dict] = _first_page_query(params, per_page, max_items, keyset)
+    remaining = max_items
+    next_endpoint: Optional[str] = endpoint
+    while next_endpoint:
+        request = client.build_request("GET", _url(next_endpoint), params=query, headers=auth_headers())
+        response = await scheduler.send(
+            "GET", lambda: client.send(request, stream=True), stream=True, endpoint=_endpoint_label(request),
+            scope=token_scope(),
+        )
+        try:
+            response.raise_for_status()
+            query = None  # subsequent page URLs carry their own query string
+            async for item in iter_json_array(response.aiter_bytes()):
+                yield validate(item) if validate else item
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+        finally:
+            await response.aclose()
+        next_endpoint = _next_page_url(response)
+
+
+class LabelIndex:
+    """Per-project index of label names used to validate labels without a round trip.
+
+    Indexes are kept per token, so that a user never sees labels loaded with
+    another user's access.
+
+    A project's labels are loaded once, following every page, and kept as a set
+    for O(1) lookups. The set is reloaded after ``ttl`` seconds, or on a lookup
+    miss once it is older than ``miss_refresh`` seconds, so labels created in
+    GitLab since the last load are picked up without reloading on every typo.
+    """
+
+    def __init__(self, ttl: float, miss_refresh: float):
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self._names: dict[str, tuple[frozenset[str], float]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def names(self, project_id, refresh: bool = False) -> frozenset[str]:
+        """Return the label names of a project, loading them if missing, expired or ``refresh`` is set."""
+        key = f"{token_scope()}:{project_id}"
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            cached = self._names.get(key)
+            if cached and not refresh and time.monotonic() - cached[1] < self.ttl:
+                return cached[0]
+            if cached and refresh and time.monotonic() - cached[1] < self.miss_refresh:
+                return cached[0]
+
+            names = frozenset([
+                label['name']
+                async for page in paginate(f"/projects/{project_id}/labels", use_cache=not refresh)
+                for label in page
+            ])
+            self._names[key] = (names, time.monotonic())
+            return names
+
+    async def find_invalid(self, project_id, label_sets: list[list[str]]) -> list[list[str]]:
+        """Return the unknown labels of each label list, checking all lists against one index load."""
+        names = await self.names(project_id)
+        invalid = [[label for label in labels if label not in names] for labels in label_sets]
+        if any(invalid):
+            names = await self.names(project_id, refresh=True)
+            invalid = [[label for label in labels if label not in names] for labels in label_sets]
+        return invalid
+
+
+label_index = LabelIndex(LABEL_INDEX_TTL, LABEL_INDEX_MISS_REFRESH)
+
+
+def split_labels(labels: Optional[str]) -> list[str]:
+    """Split a comma-separated label string as accepted by the GitLab API into label names."""
+    if not labels:
+        return []
+    return [label.strip() for label in labels.split(',') if label.strip()]
+
+
+async def validate_labels(project_id, labels) -> None:
     """Validate that the labels in the payload exist in the project."""
-    labels_response = gitlab_request("GET", f"/projects/{project_id}/labels")
-    existing_labels = {label['name'] for label in labels_response}
+    invalid_labels = (await label_index.find_invalid(project_id, [list(labels)]))[0]
+
+    if invalid_labels:
+        existing_labels = await label_index.names(project_id)
+        raise ValueError(f"Invalid labels: {', '.join(invalid_labels)}. Please use existing project labels: {', '.join(sorted(existing_labels))}")
+
+
+async def issue_exists(project_id, issue_iid) -> bool:
+    """Return whether an issue with ``issue_iid`` exists in the project (a 404 means it does not)."""
+    try:
+        await gitlab_request("GET", f"/projects/{project_id}/issues/{issue_iid}")
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == httpx.codes.NOT_FOUND:
+            return False
+        raise
+    return True
+
+
+async def run_preflight_checks(*checks: Awaitable[None]) -> None:
+    """Run independent pre-flight checks concurrently and fail fast.
+
+    The first check to raise cancels the others and its exception propagates
+    unchanged, so a write costs max(checks) rather than sum(checks) before it
+    is sent.
+    """
+    tasks = [asyncio.ensure_future(check) for check in checks]
+    try:
+        for task in asyncio.as_completed(tasks):
+            await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def gather_limited(aws: Iterable[Awaitable], limit: int) -> list:
+    """Await ``aws`` with at most ``limit`` running at once.
+
+    Results are returned in input order, with exceptions returned in place of
+    results so that one failure does not abort the others.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable):
+        async with semaphore:
+            return await aw
 
-    if any(label not in existing_labels for label in labels):
-        invalid_labels = [label for label in labels if label not in existing_labels]
-        raise ValueError(f"Invalid labels: {', '.join(invalid_labels)}. Please use existing project labels: {', '.join(existing_labels)}")
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
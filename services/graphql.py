@@ -0,0 +1,252 @@
+from typing import Any, Optional
+
+from config.config import GITLAB_URL
+from services.gitlab_api import graphql_request
+
+
+# Only fields available on GitLab 16.0 and later: an unknown field fails the whole query
+USER_FIELDS = """
+fragment UserFields on User {
+  id username name state avatarUrl webUrl publicEmail
+}
+"""
+
+MERGE_REQUEST_FIELDS = """
+fragment MergeRequestFields on MergeRequest {
+  id iid projectId title description state createdAt updatedAt mergedAt webUrl
+  sourceBranch targetBranch sourceProjectId targetProjectId draft detailedMergeStatus conflicts
+  upvotes downvotes userNotesCount diffHeadSha mergeCommitSha squash reference(full: true)
+  author { ...UserFields }
+  mergeUser { ...UserFields }
+  assignees { nodes { ...UserFields } }
+  reviewers { nodes { ...UserFields } }
+  labels { nodes { title } }
+}
+"""
+
+ISSUE_CONTEXT_FIELDS = """
+fragment IssueContext on Project {
+  issue(iid: $iid) {
+    id iid projectId title description state type createdAt updatedAt closedAt dueDate
+    confidential discussionLocked subscribed webUrl upvotes downvotes userNotesCount mergeRequestsCount
+    blockingCount severity reference(full: true)
+    timeEstimate totalTimeSpent humanTimeEstimate humanTotalTimeSpent
+    taskCompletionStatus { count completedCount }
+    author { ...UserFields }
+    assignees { nodes { ...UserFields } }
+    labels { nodes { title } }
+    milestone {
+      id iid title description state createdAt updatedAt dueDate startDate expired webPath projectMilestone
+    }
+    notes(first: $notes) {
+      nodes { id body system internal resolvable createdAt updatedAt author { ...UserFields } }
+      pageInfo { hasNextPage }
+    }
+    relatedMergeRequests(first: $mergeRequests) {
+      nodes { ...MergeRequestFields }
+      pageInfo { hasNextPage }
+    }
+  }
+}
+"""
+
+_ISSUE_CONTEXT_VARIABLES = "$iid: String!, $notes: Int!, $mergeRequests: Int!"
+
+ISSUE_CONTEXT_BY_ID = f"""
+query IssueContextById($ids: [ID!], {_ISSUE_CONTEXT_VARIABLES}) {{
+  projects(ids: $ids) {{ nodes {{ ...IssueContext }} }}
+}}
+{ISSUE_CONTEXT_FIELDS}{MERGE_REQUEST_FIELDS}{USER_FIELDS}"""
+
+ISSUE_CONTEXT_BY_PATH = f"""
+query IssueContextByPath($fullPath: ID!, {_ISSUE_CONTEXT_VARIABLES}) {{
+  project(fullPath: $fullPath) {{ ...IssueContext }}
+}}
+{ISSUE_CONTEXT_FIELDS}{MERGE_REQUEST_FIELDS}{USER_FIELDS}"""
+
+
+async def fetch_issue_context(project_id, issue_iid: int, notes: int, merge_requests: int) -> dict:
+    """Fetch an issue with its first ``notes`` notes and ``merge_requests`` related merge requests in one query.
+
+    Returns the issue, notes and merge requests shaped like their REST
+    representations (see ``issue_from_graphql``), plus whether more notes and
+    merge requests exist than were fetched.
+    """
+    variables = {"iid": str(issue_iid), "notes": notes, "mergeRequests": merge_requests}
+    if isinstance(project_id, int) or str(project_id).isdigit():
+        data = await graphql_request(ISSUE_CONTEXT_BY_ID, {**variables, "ids": [f"gid://gitlab/Project/{project_id}"]})
+        nodes = data["projects"]["nodes"]
+        project = nodes[0] if nodes else None
+    else:
+        data = await graphql_request(ISSUE_CONTEXT_BY_PATH, {**variables, "fullPath": str(project_id)})
+        project = data["project"]
+    if project is None:
+        raise ValueError(f"Project {project_id} not found.")
+    node = project["issue"]
+    if node is None:
+        raise ValueError(f"Issue {issue_iid} not found in project {project_id}.")
+
+    issue = issue_from_graphql(node)
+    return {
+        "issue": issue,
+        "notes": [note_from_graphql(note, issue) for note in node["notes"]["nodes"]],
+        "merge_requests": [merge_request_from_graphql(mr) for mr in node["relatedMergeRequests"]["nodes"]],
+        "more_notes": node["notes"]["pageInfo"]["hasNextPage"],
+        "more_merge_requests": node["relatedMergeRequests"]["pageInfo"]["hasNextPage"],
+    }
+
+
+def gid(global_id: str) -> int:
+    """Return the numeric ID of a GraphQL global ID, e.g. 'gid://gitlab/Issue/42' -> 42."""
+    return int(global_id.rsplit("/", 1)[1])
+
+
+def _labels(node: dict) -> list[str]:
+    return [label["title"] for label in node["labels"]["nodes"]]
+
+
+def _users(connection: Optional[dict]) -> list[dict]:
+    return [user_from_graphql(user) for user in connection["nodes"]] if connection else []
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if value else value
+
+
+def user_from_graphql(node: Optional[dict]) -> Optional[dict]:
+    if node is None:
+        return None
+    return {
+        "id": gid(node["id"]),
+        "username": node["username"],
+        "name": node["name"],
+        "state": node["state"],
+        "avatar_url": node["avatarUrl"],
+        "web_url": node["webUrl"],
+        "public_email": node["publicEmail"] or None,
+    }
+
+
+def milestone_from_graphql(node: Optional[dict], project_id: int) -> Optional[dict]:
+    # Group milestones have no project, which the Milestone model requires
+    if node is None or not node["projectMilestone"]:
+        return None
+    return {
+        "id": gid(node["id"]),
+        "iid": int(node["iid"]),
+        "project_id": project_id,
+        "title": node["title"],
+        "description": node["description"],
+        "state": node["state"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "due_date": node["dueDate"],
+        "start_date": node["startDate"],
+        "expired": node["expired"],
+        "web_url": f"{GITLAB_URL}{node['webPath']}",
+    }
+
+
+def issue_from_graphql(node: dict) -> dict[str, Any]:
+    """Map a GraphQL issue onto the fields of the REST representation (``schemas.info_schemas.Issue``)."""
+    assignees = _users(node["assignees"])
+    return {
+        "id": gid(node["id"]),
+        "iid": int(node["iid"]),
+        "project_id": node["projectId"],
+        "title": node["title"],
+        "description": node["description"],
+        "state": node["state"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "closed_at": node["closedAt"],
+        "author": user_from_graphql(node["author"]),
+        "assignees": assignees,
+        "assignee": assignees[0] if assignees else None,
+        "labels": _labels(node),
+        "milestone": milestone_from_graphql(node["milestone"], node["projectId"]),
+        "type": node["type"],
+        "issue_type": _lower(node["type"]),
+        "user_notes_count": node["userNotesCount"],
+        "merge_requests_count": node["mergeRequestsCount"],
+        "upvotes": node["upvotes"],
+        "downvotes": node["downvotes"],
+        "due_date": node["dueDate"],
+        "confidential": node["confidential"],
+        "discussion_locked": node["discussionLocked"],
+        "subscribed": node["subscribed"],
+        "web_url": node["webUrl"],
+        "references": {"full": node["reference"]},
+        "time_stats": {
+            "time_estimate": node["timeEstimate"],
+            "total_time_spent": node["totalTimeSpent"],
+            "human_time_estimate": node["humanTimeEstimate"],
+            "human_total_time_spent": node["humanTotalTimeSpent"],
+        },
+        "task_completion_status": {
+            "count": node["taskCompletionStatus"]["count"],
+            "completed_count": node["taskCompletionStatus"]["completedCount"],
+        },
+        "blocking_issues_count": node["blockingCount"],
+        "severity": node["severity"],
+    }
+
+
+def note_from_graphql(node: dict, issue: dict) -> dict[str, Any]:
+    """Map a GraphQL note of ``issue`` (already mapped) onto the fields of ``schemas.info_schemas.Note``."""
+    return {
+        "id": gid(node["id"]),
+        "body": node["body"],
+        "author": user_from_graphql(node["author"]),
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "system": node["system"],
+        "noteable_id": issue["id"],
+        "noteable_type": "Issue",
+        "noteable_iid": issue["iid"],
+        "project_id": issue["project_id"],
+        "resolvable": node["resolvable"],
+        "internal": node["internal"],
+        "confidential": node["internal"],
+    }
+
+
+def merge_request_from_graphql(node: dict) -> dict[str, Any]:
+    """Map a GraphQL merge request onto the fields of ``schemas.info_schemas.MergeRequest``."""
+    assignees = _users(node["assignees"])
+    merge_user = user_from_graphql(node["mergeUser"])
+    return {
+        "id": gid(node["id"]),
+        "iid": int(node["iid"]),
+        "project_id": node["projectId"],
+        "title": node["title"],
+        "description": node["description"],
+        "state": node["state"],
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "merged_at": node["mergedAt"],
+        "author": user_from_graphql(node["author"]),
+        "assignees": assignees,
+        "assignee": assignees[0] if assignees else None,
+        "reviewers": _users(node["reviewers"]),
+        "merge_user": merge_user,
+        "merged_by": merge_user,
+        "source_branch": node["sourceBranch"],
+        "target_branch": node["targetBranch"],
+        "source_project_id": node["sourceProjectId"],
+        "target_project_id": node["targetProjectId"],
+        "labels": _labels(node),
+        "draft": node["draft"],
+        "work_in_progress": node["draft"],
+        "detailed_merge_status": _lower(node["detailedMergeStatus"]),
+        "has_conflicts": node["conflicts"],
+        "upvotes": node["upvotes"],
+        "downvotes": node["downvotes"],
+        "user_notes_count": node["userNotesCount"],
+        "sha": node["diffHeadSha"],
+        "merge_commit_sha": node["mergeCommitSha"],
+        "squash": node["squash"],
+        "web_url": node["webUrl"],
+        "reference": node["reference"],
+        "references": {"full": node["reference"]},
+    }
@@ -0,0 +1,52 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator
+
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Incrementally decode a JSON array body, yielding each element as soon as it is complete.
+
+    Only the not-yet-decoded tail of the body is buffered, so memory is bounded
+    by the size of the largest element rather than by the size of the response.
+    Elements are expected to be objects, arrays or strings (as in GitLab list
+    responses), which are self-delimiting.
+
+    Raises:
+        ValueError: If the body is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+
+    async for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Expected a JSON array response")
+                started = True
+                pos += 1
+            elif char == ",":
+                pos += 1
+            elif char == "]":
+                return
+            else:
+                try:
+                    element, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # element is incomplete, wait for more data
+                yield element
+        buffer = buffer[pos:]
+
+    # The closing bracket returns above; running out of data first means the body is incomplete
+    raise ValueError("Truncated or invalid JSON array response")
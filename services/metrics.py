@@ -0,0 +1,255 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, Optional
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class Histogram:
+    """Observation counts per bucket upper bound, plus their sum and count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None when empty or beyond the last bucket)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return None
+
+
+class Family:
+    """A named metric with one counter or histogram per combination of label values."""
+
+    def __init__(self, name: str, help: str, kind: str, labels: tuple[str, ...], buckets: tuple[float, ...] = ()):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labels = labels
+        self.buckets = buckets
+        self.samples: dict[tuple[str, ...], Any] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1) -> None:
+        self.samples[labels] = self.samples.get(labels, 0) + amount
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        histogram = self.samples.get(labels)
+        if histogram is None:
+            histogram = self.samples[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def render(self, openmetrics: bool = False) -> Iterator[str]:
+        # OpenMetrics names a counter family without the _total suffix its samples carry
+        family = self.name[:-len("_total")] if openmetrics and self.kind == "counter" else self.name
+        yield f"# HELP {family} {self.help}"
+        yield f"# TYPE {family} {self.kind}"
+        for labels, sample in list(self.samples.items()):
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, labels)]
+            if self.kind == "counter":
+                yield f"{self.name}{_labels(pairs)} {sample}"
+                continue
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), list(sample.counts)):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels([*pairs, le])} {cumulative}"
+            yield f"{self.name}_sum{_labels(pairs)} {sample.sum}"
+            yield f"{self.name}_count{_labels(pairs)} {sample.count}"
+
+
+def _labels(pairs: list[str]) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+TOOL_CALLS = Family("gitlab_mcp_tool_calls_total", "Tool calls by outcome.", "counter", ("tool", "outcome"))
+TOOL_DURATION = Family(
+    "gitlab_mcp_tool_duration_seconds", "Wall time of a tool call, including serialization.",
+    "histogram", ("tool",), LATENCY_BUCKETS,
+)
+TOOL_VALIDATION = Family(
+    "gitlab_mcp_tool_validation_seconds", "Time a tool call spent validating GitLab list responses into models.",
+    "histogram", ("tool",), LATENCY_BUCKETS,
+)
+TOOL_SERIALIZATION = Family(
+    "gitlab_mcp_tool_serialization_seconds", "Time spent converting a tool result into MCP content.",
+    "histogram", ("tool",), LATENCY_BUCKETS,
+)
+TOOL_RESPONSE_BYTES = Family(
+    "gitlab_mcp_tool_response_bytes", "Size of the text content returned by a tool.",
+    "histogram", ("tool",), SIZE_BUCKETS,
+)
+UPSTREAM_DURATION = Family(
+    "gitlab_mcp_upstream_request_duration_seconds", "Latency of a single HTTP request to GitLab.",
+    "histogram", ("method", "endpoint"), LATENCY_BUCKETS,
+)
+UPSTREAM_RESPONSES = Family(
+    "gitlab_mcp_upstream_responses_total", "HTTP responses from GitLab by status ('error' for transport failures).",
+    "counter", ("method", "endpoint", "status"),
+)
+UPSTREAM_BYTES = Family(
+    "gitlab_mcp_upstream_response_bytes_total", "Body bytes of buffered GitLab responses.",
+    "counter", ("method", "endpoint"),
+)
+UPSTREAM_RETRIES = Family(
+    "gitlab_mcp_upstream_retries_total", "GitLab requests retried by the scheduler.",
+    "counter", ("method", "endpoint"),
+)
+CACHE_HITS = Family("gitlab_mcp_cache_hits_total", "GETs served fresh from the response cache.", "counter", ("endpoint",))
+
+FAMILIES = (
+    TOOL_CALLS, TOOL_DURATION, TOOL_VALIDATION, TOOL_SERIALIZATION, TOOL_RESPONSE_BYTES,
+    UPSTREAM_DURATION, UPSTREAM_RESPONSES, UPSTREAM_BYTES, UPSTREAM_RETRIES, CACHE_HITS,
+)
+
+
+@dataclass
+class ToolCall:
+    """Measurements accumulated over one tool call, shared with the tasks it spawns."""
+
+    tool: str
+    validation: float = 0.0
+
+
+_current_call: ContextVar[Optional[ToolCall]] = ContextVar("current_tool_call", default=None)
+
+
+@contextmanager
+def tool_call(tool: str) -> Iterator[ToolCall]:
+    """Record the duration, outcome and validation time of the tool call run inside the block."""
+    call = ToolCall(tool)
+    token = _current_call.set(call)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield call
+        outcome = "ok"
+    finally:
+        _current_call.reset(token)
+        TOOL_DURATION.observe((tool,), time.perf_counter() - start)
+        TOOL_CALLS.inc((tool, outcome))
+        if call.validation:
+            TOOL_VALIDATION.observe((tool,), call.validation)
+
+
+def timed_validation(validate: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap a model validator so that its time counts towards the current tool call's validation time."""
+
+    def timed(data: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return validate(data)
+        finally:
+            call = _current_call.get()
+            if call is not None:
+                call.validation += time.perf_counter() - start
+
+    return timed
+
+
+@lru_cache(maxsize=4096)
+def endpoint_label(path: str) -> str:
+    """Collapse IDs in an API path into placeholders, e.g. '/projects/12/issues/3' -> '/projects/{id}/issues/{id}'."""
+    path = re.sub(r"^/(projects|groups)/[^/]+", r"/\1/{id}", path)
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+
+def render(openmetrics: bool = False) -> str:
+    """Return every metric in the Prometheus text format, or in OpenMetrics."""
+    lines = [line for family in FAMILIES for line in family.render(openmetrics)]
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> dict:
+    """Condensed per-tool and per-endpoint view of the metrics (durations in milliseconds)."""
+
+    def durations(histogram: Histogram) -> dict:
+        return {
+            "mean_ms": round(histogram.sum / histogram.count * 1000, 3),
+            "p50_ms": _ms(histogram.quantile(0.5)),
+            "p99_ms": _ms(histogram.quantile(0.99)),
+        }
+
+    tools: dict[str, dict] = {}
+    for (tool, outcome), count in list(TOOL_CALLS.samples.items()):
+        tools.setdefault(tool, {"calls": 0, "errors": 0})
+        tools[tool]["calls"] += count
+        if outcome == "error":
+            tools[tool]["errors"] += count
+    for family, key in ((TOOL_DURATION, "duration"), (TOOL_VALIDATION, "validation"), (TOOL_SERIALIZATION, "serialization")):
+        for (tool,), histogram in list(family.samples.items()):
+            tools.setdefault(tool, {})[key] = durations(histogram)
+    for (tool,), histogram in list(TOOL_RESPONSE_BYTES.samples.items()):
+        tools.setdefault(tool, {})["mean_response_bytes"] = round(histogram.sum / histogram.count)
+
+    endpoints: dict[str, dict] = {}
+    for (method, endpoint), histogram in list(UPSTREAM_DURATION.samples.items()):
+        endpoints[f"{method} {endpoint}"] = {"requests": histogram.count, **durations(histogram)}
+    for family, key in ((UPSTREAM_BYTES, "response_bytes"), (UPSTREAM_RETRIES, "retries")):
+        for (method, endpoint), value in list(family.samples.items()):
+            endpoints.setdefault(f"{method} {endpoint}", {})[key] = value
+    for (endpoint,), hits in list(CACHE_HITS.samples.items()):
+        endpoints.setdefault(f"GET {endpoint}", {})["cache_hits"] = hits
+    for (method, endpoint, status), count in list(UPSTREAM_RESPONSES.samples.items()):
+        endpoints.setdefault(f"{method} {endpoint}", {}).setdefault("statuses", {})[status] = count
+    return {"tools": tools, "endpoints": endpoints}
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+def serve(host: str, port: int) -> ThreadingHTTPServer:
+    """Serve ``render()`` at ``/metrics`` on a daemon thread, in OpenMetrics when the scraper asks for it."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = render(openmetrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # stdout/stderr belong to the MCP transport
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
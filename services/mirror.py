@@ -0,0 +1,188 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from config.config import GITLAB_MIRROR_PATH, GITLAB_MIRROR_MAX_AGE, GITLAB_MIRROR_MAX_ITEMS
+from services.gitlab_api import paginate, token_scope
+
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    scope TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, collection, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_order ON records (scope, collection, position);
+CREATE TABLE IF NOT EXISTS collections (
+    scope TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    complete INTEGER NOT NULL,
+    PRIMARY KEY (scope, collection)
+) WITHOUT ROWID;
+"""
+
+
+class MetadataMirror:
+    """On-disk SQLite mirror of slowly changing GitLab lists: projects, users, labels and branches.
+
+    Each list endpoint is a collection whose items are stored as JSON, indexed
+    by a key field (e.g. ``username``), so that a lookup is a single primary key
+    read and survives server restarts. A collection is loaded on first use,
+    served as is while younger than ``max_age`` seconds, and refreshed in the
+    background once older, so callers never wait for a refresh after the first
+    load. Collections are kept per token, like the response cache. Reads run
+    on worker threads, like the writes, so decoding a large collection never
+    blocks the event loop.
+
+    Only the first ``max_items`` items of a collection are stored (e.g. the
+    users of a large instance); such a collection is marked incomplete and only
+    answers lookups, whose misses fall back to the API.
+    """
+
+    def __init__(self, path: Path, max_age: float, max_items: int):
+        self.path = path
+        self.max_age = max_age
+        self.max_items = max_items
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._refreshes: dict[tuple[str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def items(self, endpoint: str, key_field: str, keyset: bool = False) -> Optional[list[dict]]:
+        """Return every item of the list at ``endpoint`` in API order, or None when the mirror holds only part of it."""
+        scope = token_scope()
+        if not await self._ensure(scope, endpoint, key_field, keyset):
+            return None
+        return await asyncio.to_thread(
+            self._query, "SELECT data FROM records WHERE scope = ? AND collection = ? ORDER BY position",
+            (scope, endpoint), lambda rows: [json.loads(data) for data, in rows],
+        )
+
+    async def get(self, endpoint: str, key_field: str, key: str, keyset: bool = False) -> Optional[dict]:
+        """Return the item of the list at ``endpoint`` whose ``key_field`` equals ``key``, if mirrored.
+
+        A collection that was never loaded answers None, for the caller to fall
+        back to the API, while its first load runs in the background.
+        """
+        scope = token_scope()
+        item = None
+        if await self._ensure(scope, endpoint, key_field, keyset, wait=False) is not None:
+            item = await asyncio.to_thread(
+                self._query, "SELECT data FROM records WHERE scope = ? AND collection = ? AND key = ?",
+                (scope, endpoint, key), lambda rows: next((json.loads(data) for data, in rows), None),
+            )
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item
+
+    async def _ensure(
+        self, scope: str, endpoint: str, key_field: str, keyset: bool, wait: bool = True
+    ) -> Optional[bool]:
+        """Load the collection if it was never loaded, schedule a refresh if stale; return whether it is complete.
+
+        Without ``wait``, a first load runs in the background and None is returned.
+        """
+        row = await asyncio.to_thread(
+            self._query, "SELECT refreshed_at, complete FROM collections WHERE scope = ? AND collection = ?",
+            (scope, endpoint), lambda rows: rows.fetchone(),
+        )
+        if row is None:
+            task = self._refresh(scope, endpoint, key_field, keyset)
+            return await asyncio.shield(task) if wait else None
+        if time.time() - row[0] >= self.max_age:
+            self._refresh(scope, endpoint, key_field, keyset)
+        return bool(row[1])
+
+    def _refresh(self, scope: str, endpoint: str, key_field: str, keyset: bool) -> asyncio.Task:
+        """Start reloading a collection unless a reload is already running; return the reload task."""
+        task = self._refreshes.get((scope, endpoint))
+        if task is None:
+            task = asyncio.ensure_future(self._load(scope, endpoint, key_field, keyset))
+            self._refreshes[(scope, endpoint)] = task
+            task.add_done_callback(lambda done: self._landed(scope, endpoint, done))
+        return task
+
+    def _landed(self, scope: str, endpoint: str, task: asyncio.Task) -> None:
+        del self._refreshes[(scope, endpoint)]
+        if task.cancelled() or task.exception() is not None:
+            self.refresh_errors += 1  # stale items are kept until the next refresh succeeds
+
+    async def _load(self, scope: str, endpoint: str, key_field: str, keyset: bool) -> bool:
+        limit = self.max_items + 1  # one more item than stored tells whether the list is complete
+        items = [
+            item
+            async for page in paginate(endpoint, max_items=limit, keyset=keyset, use_cache=False)
+            for item in page
+        ]
+        complete = len(items) < limit
+        await asyncio.to_thread(self._store, scope, endpoint, key_field, items[:self.max_items], complete)
+        self.refreshes += 1
+        return complete
+
+    def _store(self, scope: str, endpoint: str, key_field: str, items: list[dict], complete: bool) -> None:
+        rows = [(scope, endpoint, str(item[key_field]), position, json.dumps(item)) for position, item in enumerate(items)]
+        with self._write_lock, self._connect("_writer") as db:
+            db.execute("DELETE FROM records WHERE scope = ? AND collection = ?", (scope, endpoint))
+            db.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute(
+                "INSERT OR REPLACE INTO collections VALUES (?, ?, ?, ?)", (scope, endpoint, time.time(), complete),
+            )
+
+    def _query(self, sql: str, params: tuple, collect: Callable[[sqlite3.Cursor], T]) -> T:
+        """Run a read query on the reader connection and ``collect`` its result (on a worker thread)."""
+        with self._read_lock:
+            return collect(self._connect("_reader").execute(sql, params))
+
+    def _counts(self) -> tuple[tuple, int]:
+        collections = self._query("SELECT COUNT(*), SUM(complete) FROM collections", (), lambda rows: rows.fetchone())
+        return collections, self._query("SELECT COUNT(*) FROM records", (), lambda rows: rows.fetchone()[0])
+
+    def _connect(self, attribute: str) -> sqlite3.Connection:
+        """Return the reader or writer connection, opening the database on first use.
+
+        Both are used on worker threads, one at a time each; WAL mode lets reads
+        proceed during a refresh, and lets several server processes share the
+        file.
+        """
+        db = getattr(self, attribute)
+        if db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            setattr(self, attribute, db)
+        return db
+
+    async def stats(self) -> dict:
+        collections, items = await asyncio.to_thread(self._counts)
+        return {
+            "path": str(self.path),
+            "collections": collections[0],
+            "complete": collections[1] or 0,
+            "items": items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+metadata_mirror = MetadataMirror(GITLAB_MIRROR_PATH, GITLAB_MIRROR_MAX_AGE, GITLAB_MIRROR_MAX_ITEMS)
@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from services import metrics
+from config.config import (
+    GITLAB_RATE_LIMIT,
+    GITLAB_RATE_BURST,
+    GITLAB_MAX_RETRIES,
+    GITLAB_BACKOFF_BASE,
+    GITLAB_BACKOFF_MAX,
+)
+from config.constants import RATE_LIMIT_MAX_SCOPES
+
+
+# Responses worth retrying: rate limited, or a transient gateway/availability error.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Lower values are dispatched first when requests are queued behind the rate limit.
+WRITE_PRIORITY = 0
+READ_PRIORITY = 1
+
+
+class _Bucket:
+    """Rate-limit state of one token: its token bucket, GitLab window, pause and dispatch queue."""
+
+    def __init__(self, burst: int):
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.window_rate: Optional[float] = None
+        self.window_ends = 0.0
+        self.paused_until = 0.0
+        self.queue: list[tuple[int, int]] = []
+        self.condition: Optional[asyncio.Condition] = None
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and time.monotonic() >= self.paused_until
+
+
+class RequestScheduler:
+    """Paces GitLab requests and retries the ones that fail transiently.
+
+    Outgoing requests take a token from a bucket refilled at ``rate`` requests
+    per second (up to ``burst`` tokens); a ``rate`` of 0 disables pacing. The
+    bucket also follows GitLab's ``RateLimit-Remaining``/``RateLimit-Reset``
+    headers: the refill rate is lowered to what is left of the current window,
+    and dispatch pauses until the reset once the window is exhausted or a 429
+    asks to ``Retry-After``. Requests waiting for a token are served by priority,
+    so writes are not starved by a backlog of page fetches.
+
+    GitLab limits each user separately, so all of this state is kept per
+    ``scope`` (a digest of the request's token, see
+    ``services.gitlab_api.token_scope``): one user's exhausted window or 429
+    does not hold back the others. The least recently used idle scopes are
+    forgotten beyond ``RATE_LIMIT_MAX_SCOPES``.
+
+    GETs are retried on 429/502/503/504 and on transport errors; writes only on
+    429 (GitLab rejected them before processing) and on failures to connect,
+    since otherwise they may already have been applied. Retries back off
+    exponentially with full jitter, or for as long as ``Retry-After`` says.
+    """
+
+    def __init__(self, rate: float, burst: int, max_retries: int, backoff_base: float, backoff_max: float):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._seq = itertools.count()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+    async def send(
+        self,
+        method: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        stream: bool = False,
+        endpoint: str = "",
+        read: Optional[bool] = None,
+        scope: str = "",
+    ) -> httpx.Response:
+        """Dispatch ``send()`` under the rate limit of ``scope``, retrying per the policy above.
+
+        Returns the last response, which may still be an error status once the
+        retries are exhausted. Discarded streamed responses are closed. Every
+        attempt is recorded in the upstream metrics under ``endpoint``. Pass
+        ``read=True`` for a POST that only reads, e.g. a GraphQL query, to have it
+        scheduled and retried like a GET.
+        """
+        read = method == "GET" if read is None else read
+        priority = READ_PRIORITY if read else WRITE_PRIORITY
+        labels = (method, endpoint)
+        attempt = 0
+        while True:
+            await self.acquire(priority, scope)
+            self.requests += 1
+            start = time.perf_counter()
+            try:
+                response = await send()
+            except httpx.TransportError as exc:
+                metrics.UPSTREAM_DURATION.observe(labels, time.perf_counter() - start)
+                metrics.UPSTREAM_RESPONSES.inc((*labels, "error"))
+                retryable = read or isinstance(exc, httpx.ConnectError)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                metrics.UPSTREAM_DURATION.observe(labels, time.perf_counter() - start)
+                metrics.UPSTREAM_RESPONSES.inc((*labels, str(response.status_code)))
+                if not stream:
+                    metrics.UPSTREAM_BYTES.inc(labels, len(response.content))
+                self.observe(response, scope)
+                retryable = response.status_code == 429 or (
+                    read and response.status_code in RETRY_STATUSES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = max(self._backoff(attempt), _retry_after(response) or 0.0)
+                if stream:
+                    await response.aclose()
+            attempt += 1
+            self.retries += 1
+            metrics.UPSTREAM_RETRIES.inc(labels)
+            await asyncio.sleep(delay)
+
+    async def acquire(self, priority: int = READ_PRIORITY, scope: str = "") -> None:
+        """Wait for a token of ``scope``, behind its queued requests of the same or a higher priority."""
+        bucket = self._bucket(scope)
+        if bucket.condition is None:
+            bucket.condition = asyncio.Condition()
+        if not bucket.queue and self._take(bucket):
+            return
+
+        entry = (priority, next(self._seq))
+        self.throttled += 1
+        async with bucket.condition:
+            heapq.heappush(bucket.queue, entry)
+            try:
+                while True:
+                    if bucket.queue[0] != entry:
+                        await bucket.condition.wait()
+                        continue
+                    if self._take(bucket):
+                        heapq.heappop(bucket.queue)
+                        return
+                    try:
+                        await asyncio.wait_for(bucket.condition.wait(), self._delay(bucket))
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                if entry in bucket.queue:
+                    bucket.queue.remove(entry)
+                    heapq.heapify(bucket.queue)
+                bucket.condition.notify_all()
+
+    def observe(self, response: httpx.Response, scope: str = "") -> None:
+        """Adapt the pacing of ``scope`` to the rate-limit headers of a GitLab response."""
+        bucket = self._bucket(scope)
+        now = time.monotonic()
+        remaining = _float_header(response, "RateLimit-Remaining")
+        reset = _float_header(response, "RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            window = max(reset - time.time(), 0.1)
+            bucket.window_rate = max(remaining, 0.0) / window
+            bucket.window_ends = now + window
+            if remaining <= 0:
+                bucket.paused_until = max(bucket.paused_until, now + window)
+        if response.status_code == 429:
+            bucket.paused_until = max(bucket.paused_until, now + (_retry_after(response) or self._backoff(0)))
+
+    def stats(self, scope: str = "") -> dict:
+        """Report the counters of every scope, and the current rate of ``scope``."""
+        bucket = self._buckets.get(scope)
+        return {
+            "rate": self._current_rate(bucket, time.monotonic()) if bucket else self.rate,
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "queued": sum(len(bucket.queue) for bucket in self._buckets.values()),
+            "scopes": len(self._buckets),
+        }
+
+    def _bucket(self, scope: str) -> _Bucket:
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            bucket = self._buckets[scope] = _Bucket(self.burst)
+            if len(self._buckets) > RATE_LIMIT_MAX_SCOPES:
+                idle = next((key for key, other in self._buckets.items() if other.idle and other is not bucket), None)
+                if idle is not None:
+                    del self._buckets[idle]
+        self._buckets.move_to_end(scope)
+        return bucket
+
+    def _current_rate(self, bucket: _Bucket, now: float) -> float:
+        """Refill rate of ``bucket`` in tokens per second; 0 means unpaced."""
+        if bucket.window_rate is None or now >= bucket.window_ends:
+            return self.rate
+        return min(self.rate, bucket.window_rate) if self.rate else bucket.window_rate
+
+    def _take(self, bucket: _Bucket) -> bool:
+        """Take a token from ``bucket`` if one is available now."""
+        now = time.monotonic()
+        if now < bucket.paused_until:
+            return False
+        rate = self._current_rate(bucket, now)
+        if not rate:
+            return True
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.refilled_at) * rate)
+        bucket.refilled_at = now
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
+
+    def _delay(self, bucket: _Bucket) -> float:
+        """Seconds until ``_take(bucket)`` can next succeed."""
+        now = time.monotonic()
+        if now < bucket.paused_until:
+            return bucket.paused_until - now
+        rate = self._current_rate(bucket, now)
+        return max((1 - bucket.tokens) / rate, 0.001) if rate else 0.001
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+def _float_header(response: httpx.Response, name: str) -> Optional[float]:
+    try:
+        return float(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header, given as a delay or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+scheduler = RequestScheduler(
+    GITLAB_RATE_LIMIT, GITLAB_RATE_BURST, GITLAB_MAX_RETRIES, GITLAB_BACKOFF_BASE, GITLAB_BACKOFF_MAX
+)
@@ -0,0 +1,151 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Literal, Optional
+
+from config.config import GITLAB_SYNC_MAX_PROJECTS
+from config.constants import DEFAULT_PER_PAGE
+from services.gitlab_api import paginate, token_scope
+
+
+SyncKind = Literal["issues", "merge_requests"]
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a GitLab ISO 8601 timestamp (e.g. '2024-05-20T14:02:57.018Z') into an aware datetime."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass
+class Mirror:
+    """Local copy of one project's issues or merge requests, keyed by iid."""
+
+    items: dict[int, dict] = field(default_factory=dict)
+    updated: dict[int, datetime] = field(default_factory=dict)
+    watermark: Optional[str] = None  # greatest updated_at seen, verbatim as sent by GitLab
+    watermark_at: Optional[datetime] = None
+
+    def merge(self, item: dict) -> bool:
+        """Store ``item`` unless the stored copy is as recent; return whether it was stored."""
+        updated = parse_timestamp(item["updated_at"])
+        known = self.updated.get(item["iid"])
+        if known is not None and known >= updated:
+            return False
+        self.items[item["iid"]] = item
+        self.updated[item["iid"]] = updated
+        if self.watermark_at is None or updated > self.watermark_at:
+            self.watermark, self.watermark_at = item["updated_at"], updated
+        return True
+
+    def changed_since(self, since: datetime) -> list[dict]:
+        """Return the items updated after ``since``, least recently updated first."""
+        changed = [iid for iid, updated in self.updated.items() if updated > since]
+        return [self.items[iid] for iid in sorted(changed, key=self.updated.__getitem__)]
+
+    def discard(self, iid: int) -> None:
+        self.items.pop(iid, None)
+        self.updated.pop(iid, None)
+
+
+async def _updated_since(endpoint: str, after: Optional[str]) -> AsyncIterator[list[dict]]:
+    """Yield the pages of ``endpoint`` updated at or after ``after`` (all when not set), least recently updated first.
+
+    Pages are requested one at a time, each with ``updated_after`` moved to the
+    latest ``updated_at`` seen so far rather than by page offset: an item
+    updated during the walk moves to the end of the list, which would shift
+    the items behind it across an offset page boundary and skip one for good.
+    ``updated_after`` is inclusive, so the last items are returned again. Only
+    when a whole page shares one timestamp does the walk go on by offset.
+    """
+    params = {"order_by": "updated_at", "sort": "asc"}
+    page_number = 1
+    while True:
+        query = {**params, "page": page_number}
+        if after is not None:
+            query["updated_after"] = after
+        page = [
+            item
+            async for items in paginate(endpoint, query, max_items=DEFAULT_PER_PAGE, concurrency=1, use_cache=False)
+            for item in items
+        ]
+        yield page
+        if len(page) < DEFAULT_PER_PAGE:
+            return
+        if page[-1]["updated_at"] != after:
+            after, page_number = page[-1]["updated_at"], 1
+        else:
+            page_number += 1
+
+
+class SyncStore:
+    """Per-project mirrors of issues and merge requests, kept current with ``updated_after`` watermarks.
+
+    The first sync of a project lists every item. Later syncs only request the
+    items with ``updated_after`` at the greatest ``updated_at`` seen so far and
+    merge them into the mirror, so a sync of a quiet project is a single small
+    request. The watermark comes from GitLab's own timestamps, so the local
+    clock never matters. ``updated_after`` is inclusive: items updated at the
+    watermark itself are returned again and skipped as unchanged. Both kinds
+    of sync page on the timestamp too (see ``_updated_since``), so an item
+    updated while a sync runs cannot make it miss another.
+
+    GitLab does not report deleted items through ``updated_after``; items deleted
+    through this server are dropped with ``discard``, others stay in the mirror
+    until a full sync. Mirrors are kept per token, like the label index, and
+    the least recently synced mirrors are dropped beyond ``max_projects``.
+    """
+
+    def __init__(self, max_projects: int):
+        self.max_projects = max_projects
+        self._mirrors: OrderedDict[str, Mirror] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+
+    async def sync(self, project_id, kind: SyncKind, full: bool = False) -> tuple[Mirror, list[dict], bool]:
+        """Bring the mirror of a project's ``kind`` up to date.
+
+        Returns the mirror, the items stored by this sync (least recently updated
+        first) and whether it was a full sync.
+        """
+        key = f"{token_scope()}:{project_id}:{kind}"
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            mirror = self._mirrors.get(key)
+            full = full or mirror is None or mirror.watermark is None
+            if full:
+                mirror = Mirror()
+
+            changed = [
+                item
+                async for page in _updated_since(f"/projects/{project_id}/{kind}", None if full else mirror.watermark)
+                for item in page
+                if mirror.merge(item)
+            ]
+
+            self._mirrors[key] = mirror
+            self._mirrors.move_to_end(key)
+            while len(self._mirrors) > self.max_projects:
+                self._mirrors.popitem(last=False)
+            if full:
+                self.full_syncs += 1
+            else:
+                self.incremental_syncs += 1
+            return mirror, changed, full
+
+    def discard(self, project_id, kind: SyncKind, iid: int) -> None:
+        """Drop a deleted item from the project's mirror, if there is one."""
+        mirror = self._mirrors.get(f"{token_scope()}:{project_id}:{kind}")
+        if mirror is not None:
+            mirror.discard(iid)
+
+    def stats(self) -> dict:
+        return {
+            "mirrors": len(self._mirrors),
+            "items": sum(len(mirror.items) for mirror in self._mirrors.values()),
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+        }
+
+
+sync_store = SyncStore(GITLAB_SYNC_MAX_PROJECTS)
@@ -1,12 +1,48 @@
+import asyncio
+
+from config.config import GITLAB_BATCH_CONCURRENCY
 from schemas.action_schemas import *
 from schemas.info_schemas import Issue, Note
 from server import mcp
-from services.gitlab_api import gitlab_request, validate_labels
-from .info_tools import get_issue_details
+from services.gitlab_api import (
+    gather_limited,
+    gitlab_request,
+    issue_exists,
+    label_index,
+    prime_cache,
+    run_preflight_checks,
+    split_labels,
+    validate_labels,
+)
+from services.sync import sync_store
+
+
+def _issue_labels(payload: CreateIssueRequest | EditIssueRequest) -> list[str]:
+    """Return the labels an issue payload sets or adds, which must exist in the project."""
+    return split_labels(payload.labels) + split_labels(getattr(payload, 'add_labels', None))
+
+
+async def _check_iid_available(project_id, iid) -> None:
+    if await issue_exists(project_id, iid):
+        raise ValueError(f"Issue with IID {iid} already exists in project {project_id}.")
+
+
+async def _create_issue(payload: CreateIssueRequest) -> dict:
+    issue_info_data = payload.model_dump(exclude={'project_id'}, exclude_none=True)
+    response = await gitlab_request("POST", f"/projects/{payload.project_id}/issues", params=issue_info_data)
+    prime_cache(f"/projects/{payload.project_id}/issues/{response['iid']}", response)
+    return response
+
+
+async def _edit_issue(payload: EditIssueRequest) -> dict:
+    issue_info_data = payload.model_dump(exclude={'project_id', 'issue_iid'}, exclude_none=True)
+    response = await gitlab_request("PUT", f"/projects/{payload.project_id}/issues/{payload.issue_iid}", params=issue_info_data)
+    prime_cache(f"/projects/{payload.project_id}/issues/{payload.issue_iid}", response)
+    return response
 
 
 @mcp.tool(title="Create GitLab Merge Request")
-def create_merge_request(payload: CreateMergeRequestRequest) -> CreateMergeRequestResponse:
+async def create_merge_request(payload: CreateMergeRequestRequest) -> CreateMergeRequestResponse:
     """Create a new GitLab merge request in a specific project.
 
     Args:
@@ -18,69 +54,131 @@ def create_merge_request(payload: CreateMergeRequestRequest) -> CreateMergeReque
 
     # Validate labels against existing project labels
     if payload.labels:
-        labels_list = [label.strip() for label in payload.labels.split(',')]
-        validate_labels(payload.project_id, labels_list)
+        await validate_labels(payload.project_id, split_labels(payload.labels))
 
     mr_data = payload.model_dump(exclude={'project_id'}, exclude_none=True)
-    response = gitlab_request("POST", f"/projects/{payload.project_id}/merge_requests", params=mr_data)
+    response = await gitlab_request("POST", f"/projects/{payload.project_id}/merge_requests", params=mr_data)
 
     return CreateMergeRequestResponse(**response)
 
 
 @mcp.tool(title="Create GitLab Issue")
-def create_issue(payload: CreateIssueRequest) -> CreateIssueResponse:
+async def create_issue(payload: CreateIssueRequest) -> CreateIssueResponse:
     """Create a new GitLab issue in a specific project."""
 
-    # Validate labels against existing project labels
+    # Validate labels against existing project labels and check the requested IID concurrently
+    checks = []
     if payload.labels:
-        labels_list = [label.strip() for label in payload.labels.split(',')]
-        validate_labels(payload.project_id, labels_list)
-    
+        checks.append(validate_labels(payload.project_id, _issue_labels(payload)))
     if payload.iid:
-        try:
-            get_issue_details(payload.project_id, payload.iid)
-            raise ValueError(f"Issue with IID {payload.iid} already exists in project {payload.project_id}.")
-        except Exception:
-            pass  # Issue does not exist, proceed to create
+        checks.append(_check_iid_available(payload.project_id, payload.iid))
+    await run_preflight_checks(*checks)
 
-    issue_info_data = payload.model_dump(exclude={'project_id'}, exclude_none=True)
-    response = gitlab_request("POST", f"/projects/{payload.project_id}/issues", params=issue_info_data)
+    response = await _create_issue(payload)
 
     return CreateIssueResponse(**response)
 
 
 @mcp.tool(title="Edit GitLab Issue")
-def edit_issue(payload: EditIssueRequest) -> Issue:
+async def edit_issue(payload: EditIssueRequest) -> Issue:
     """Edit an existing GitLab issue in a specific project."""
 
     # Validate labels against existing project labels
-    if payload.labels:
-        labels_list = [label.strip() for label in payload.labels.split(',')]
-        validate_labels(payload.project_id, labels_list)
+    labels_list = _issue_labels(payload)
+    if labels_list:
+        await validate_labels(payload.project_id, labels_list)
 
-    issue_info_data = payload.model_dump(exclude={'project_id', 'issue_iid'}, exclude_none=True)
-    response = gitlab_request("PUT", f"/projects/{payload.project_id}/issues/{payload.issue_iid}", params=issue_info_data)
+    response = await _edit_issue(payload)
 
     return Issue(**response)
 
 
 @mcp.tool(title="Delete GitLab Issue")
-def delete_issue(project_id: int, issue_iid: int) -> dict:
+async def delete_issue(project_id: int, issue_iid: int) -> dict:
     """Delete an existing GitLab issue in a specific project. Only for administrators and project owners."""
     
-    response = gitlab_request("DELETE", f"/projects/{project_id}/issues/{issue_iid}")
+    response = await gitlab_request("DELETE", f"/projects/{project_id}/issues/{issue_iid}")
     success = response is None or response == ''
+    sync_store.discard(project_id, "issues", issue_iid)
     
     return {"success": success}
 
 
 @mcp.tool(title="Create GitLab Issue Note")
-def create_issue_note(payload: CreateIssueNoteRequest) -> Note:
+async def create_issue_note(payload: CreateIssueNoteRequest) -> Note:
     """Create a new note on a specific GitLab issue."""
 
     note_data = payload.model_dump(exclude={"project_id", "issue_iid"}, exclude_none=True)
-    response = gitlab_request(
+    response = await gitlab_request(
         "POST", f"/projects/{payload.project_id}/issues/{payload.issue_iid}/notes", params=note_data
     )
 
     return Note(**response)
+
+
+async def _run_issue_batch(items: list[CreateIssueRequest] | list[EditIssueRequest], operation) -> BatchIssueResponse:
+    """Validate labels once per project, then run ``operation`` on every item with bounded concurrency."""
+    errors: list[Exception | None] = [None] * len(items)
+
+    by_project: dict[str, list[int]] = {}
+    for index, item in enumerate(items):
+        by_project.setdefault(str(item.project_id), []).append(index)
+
+    async def check_project(indices: list[int]) -> None:
+        project_id = items[indices[0]].project_id
+        try:
+            invalid = await label_index.find_invalid(project_id, [_issue_labels(items[i]) for i in indices])
+        except Exception as e:
+            invalid = [e] * len(indices)
+        for index, item_invalid in zip(indices, invalid):
+            if isinstance(item_invalid, Exception):
+                errors[index] = item_invalid
+            elif item_invalid:
+                errors[index] = ValueError(f"Invalid labels: {', '.join(item_invalid)}")
+
+    await asyncio.gather(*(check_project(indices) for indices in by_project.values()))
+
+    async def run(index: int):
+        if errors[index]:
+            raise errors[index]
+        return await operation(items[index])
+
+    outcomes = await gather_limited([run(index) for index in range(len(items))], GITLAB_BATCH_CONCURRENCY)
+
+    results = []
+    for index, (item, outcome) in enumerate(zip(items, outcomes)):
+        if isinstance(outcome, Exception):
+            results.append(BatchIssueResult(index=index, project_id=item.project_id, success=False, error=str(outcome)))
+        else:
+            results.append(BatchIssueResult(index=index, project_id=item.project_id, success=True, issue=Issue(**outcome)))
+
+    succeeded = sum(result.success for result in results)
+    return BatchIssueResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+
+@mcp.tool(title="Batch Create GitLab Issues")
+async def batch_create_issues(payload: BatchCreateIssuesRequest) -> BatchIssueResponse:
+    """Create many GitLab issues in one call.
+
+    Labels are validated once per project and the issues are created concurrently.
+    Each item reports its own result or error, so one failure does not abort the batch.
+    """
+
+    async def create(item: CreateIssueRequest) -> dict:
+        if item.iid:
+            await _check_iid_available(item.project_id, item.iid)
+        return await _create_issue(item)
+
+    return await _run_issue_batch(payload.issues, create)
+
+
+@mcp.tool(title="Batch Edit GitLab Issues")
+async def batch_edit_issues(payload: BatchEditIssuesRequest) -> BatchIssueResponse:
+    """Edit, close, reopen or relabel many GitLab issues in one call.
+
+    Use state_event to close or reopen and labels/add_labels/remove_labels to relabel.
+    Labels are validated once per project and the edits run concurrently.
+    Each item reports its own result or error, so one failure does not abort the batch.
+    """
+
+    return await _run_issue_batch(payload.issues, _edit_issue)
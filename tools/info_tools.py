@@ -1,9 +1,24 @@
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import quote
 
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel
+
+from config.config import GITLAB_COMPACT_OUTPUT, GITLAB_MIRROR_ENABLED
+from schemas.decoding import item_validator, list_decoder, response_model
 from schemas.info_schemas import *
 from server import mcp
-from services.gitlab_api import gitlab_request
+from services import metrics
+from services.aggregate import aggregate, matches
+from services.cache import response_cache
+from services.gitlab_api import gitlab_request, paginate, single_flight, stream_items, token_scope
+from services.fanout import merge_sorted, project_set_endpoints
+from services.graphql import fetch_issue_context
+from services.mirror import metadata_mirror
+from services.scheduler import scheduler
+from services.sync import SyncKind, sync_store
 
 
 def _prepare_query_params(raw_params: dict[str, Any]) -> dict[str, Any]:
@@ -18,8 +33,85 @@ def _prepare_query_params(raw_params: dict[str, Any]) -> dict[str, Any]:
     return formatted_params
 
 
+def _projection(model: type[BaseModel], fields: Optional[list[str]]) -> Optional[set[str]]:
+    """Return the field names to keep for a ``fields`` projection, always including required fields."""
+    if not fields:
+        return None
+    unknown = set(fields) - model.model_fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(model.model_fields)}")
+    return set(fields) | {name for name, field in model.model_fields.items() if field.is_required()}
+
+
+def _build(model: type[BaseModel], data: dict, keep: Optional[set[str]]) -> BaseModel:
+    """Build ``model`` from ``data``, validating only the projected fields when ``keep`` is set."""
+    if keep is None:
+        return model(**data)
+    return model(**{key: value for key, value in data.items() if key in keep})
+
+
+async def _from_mirror(endpoint: str, key_field: str, max_items: Optional[int], keyset: bool = False) -> Optional[list[dict]]:
+    """Return the items of an unfiltered list from the metadata mirror, or None when the mirror cannot answer it."""
+    if not GITLAB_MIRROR_ENABLED:
+        return None
+    items = await metadata_mirror.items(endpoint, key_field, keyset)
+    return None if items is None else items[:max_items]
+
+
+async def _sync(payload: SyncRequest, kind: SyncKind, model: type[BaseModel]) -> dict:
+    """Sync the project's mirror of ``kind`` and return the fields shared by IssueSync and MergeRequestSync."""
+    mirror, changed, full = await sync_store.sync(payload.project_id, kind, full=payload.full)
+    if payload.since is not None:
+        since = payload.since if payload.since.tzinfo else payload.since.replace(tzinfo=timezone.utc)
+        changed = mirror.changed_since(since)
+    validate = item_validator(model)
+    return {
+        kind: [validate(item) for item in changed],
+        "watermark": mirror.watermark,
+        "total": len(mirror.items),
+        "full_sync": full,
+    }
+
+
+def _sparse_result(result: BaseModel) -> CallToolResult:
+    """Serialize only the fields that were set on ``result`` (i.e. the projected ones)."""
+    structured = result.model_dump(mode="json", exclude_unset=True)
+    text = pydantic_core.to_json(structured).decode()
+    return CallToolResult(content=[TextContent(type="text", text=text)], structuredContent=structured)
+
+
+def _compact_result(result: BaseModel) -> CallToolResult:
+    """Serialize a list result as a table: the item fields in use as ``columns`` and one row of values per item.
+
+    Null and default values are dropped from every item (nested objects included) before the table is
+    built, so a field gets a column only if some item has a value for it, and a null cell stands for the
+    field's default. Trailing null cells are left off, so rows may be shorter than ``columns``. The table
+    replaces the item field in the structured content, as the output schema declares (see ``ItemList``).
+    """
+    (name,) = type(result).model_fields  # list models hold their items in a single field
+    items = result.model_dump(mode="json", exclude_none=True, exclude_defaults=True).get(name, [])
+    columns = list(dict.fromkeys(key for item in items for key in item))
+    rows = []
+    for item in items:
+        row = [item.get(column) for column in columns]
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+    structured = {"columns": columns, "rows": rows}
+    text = pydantic_core.to_json(structured).decode()
+    return CallToolResult(content=[TextContent(type="text", text=text)], structuredContent=structured)
+
+
+def _listing(result: BaseModel, compact: Optional[bool], sparse: bool = False) -> BaseModel | CallToolResult:
+    """Return a list tool's ``result`` as a compact table when ``compact`` (GITLAB_COMPACT_OUTPUT when not set)
+    asks for it, otherwise as is, serializing only its projected fields when ``sparse``."""
+    if GITLAB_COMPACT_OUTPUT if compact is None else compact:
+        return _compact_result(result)
+    return _sparse_result(result) if sparse else result
+
+
 @mcp.tool(title="List GitLab Project Repository Branches")
-def list_project_repository_branches(payload: ListBranchesRequest) -> BranchList:
+async def list_project_repository_branches(payload: ListBranchesRequest) -> BranchList:
     """
     List repository branches for a GitLab project, with optional regex or search filtering.
 
@@ -28,99 +120,346 @@ def list_project_repository_branches(payload: ListBranchesRequest) -> BranchList
             - project_id (str|int): Project ID or URL-encoded path of the project (required)
             - regex (str): Return branches matching a re2 regex (optional)
             - search (str): Return branches containing the search string (optional)
+            - per_page (int): Number of branches fetched per page (optional, default 100)
+            - max_items (int): Maximum number of branches to return; all pages are fetched when not set (optional)
+            - compact (bool): Return the branches as a table of columns and rows (optional, default GITLAB_COMPACT_OUTPUT)
 
     Returns:
         BranchList: List of branches with detailed info, including protection, merge status, and commit details.
     """
-    params = payload.model_dump(exclude={'project_id'}, exclude_none=True)
-    response = gitlab_request("GET", f"/projects/{payload.project_id}/repository/branches", params=params)
-    return BranchList(branches=[BranchInfo(**branch) for branch in response])
+    params = payload.model_dump(exclude={'project_id', 'per_page', 'max_items', 'compact'}, exclude_none=True)
+    endpoint = f"/projects/{payload.project_id}/repository/branches"
+
+    mirrored = None if params else await _from_mirror(endpoint, "name", payload.max_items)
+    if mirrored is not None:
+        validate = item_validator(BranchInfo)
+        return _listing(response_model(BranchList)(branches=[validate(branch) for branch in mirrored]), payload.compact)
+
+    branches = []
+    async for page in paginate(
+        endpoint, params, per_page=payload.per_page, max_items=payload.max_items, decode=list_decoder(BranchInfo),
+    ):
+        branches.extend(page)
+    return _listing(response_model(BranchList)(branches=branches), payload.compact)
 
 
 @mcp.tool(title="GitLab API Health Check")
-def gitlab_api_health_check() -> dict:
+async def gitlab_api_health_check() -> dict:
     """Check the health of the GitLab API connection."""
 
     try:
-        response = gitlab_request("GET", "/version")
+        response = await gitlab_request("GET", "/version")
         return {"status": "healthy", "version": response.get("version", "unknown")}
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
 
 
+@mcp.tool(title="GitLab Response Cache Stats")
+async def gitlab_cache_stats() -> dict:
+    """Report hit, miss, revalidation and eviction counters of the GitLab response cache,
+    how many GET requests were coalesced into an identical in-flight request, and the
+    size of the issue and merge request mirrors kept for incremental syncs, and the state of
+    the on-disk metadata mirror when enabled."""
+
+    stats = {**response_cache.stats(), "coalesced": single_flight.coalesced, "sync": sync_store.stats()}
+    if GITLAB_MIRROR_ENABLED:
+        stats["mirror"] = await metadata_mirror.stats()
+    return stats
+
+
+@mcp.tool(title="Server Metrics")
+async def server_metrics(prometheus: bool = False) -> dict:
+    """Report per-tool and per-GitLab-endpoint latency, validation and serialization time, response sizes,
+    retries and cache hits, plus the request scheduler's state.
+
+    Set prometheus to true to get the raw metrics in the Prometheus text format instead.
+    """
+
+    if prometheus:
+        return {"text": metrics.render()}
+    return {**metrics.summary(), "scheduler": scheduler.stats(token_scope())}
+
+
 @mcp.tool(title="List GitLab Projects")
-def list_projects() -> ProjectList:
-    """List all GitLab projects accessible by the user."""
+async def list_projects(
+    max_items: Optional[int] = None, fields: Optional[list[str]] = None, compact: Optional[bool] = None
+) -> ProjectList:
+    """List all GitLab projects accessible by the user, following pagination up to max_items (all when not set).
+
+    Pass fields (e.g. ["id", "path_with_namespace"]) to return only those Project fields, and compact to
+    return them as a table of columns and rows (defaults to GITLAB_COMPACT_OUTPUT).
+    """
 
-    response = gitlab_request("GET", "/projects")
+    keep = _projection(Project, fields)
 
-    return ProjectList(projects=[Project(**project) for project in response])
+    mirrored = await _from_mirror("/projects", "path_with_namespace", max_items, keyset=True)
+    if mirrored is not None and keep is not None:
+        return _listing(ProjectList(projects=[_build(Project, project, keep) for project in mirrored]), compact, sparse=True)
+    if mirrored is not None:
+        validate = item_validator(Project)
+        return _listing(response_model(ProjectList)(projects=[validate(project) for project in mirrored]), compact)
+
+    # GitLab's simple project representation covers every Project field but visibility
+    params = {"simple": "true"} if keep is not None and "visibility" not in keep else None
+
+    if keep is not None:
+        projects = [
+            _build(Project, project, keep)
+            async for page in paginate("/projects", params, max_items=max_items, keyset=True)
+            for project in page
+        ]
+        return _listing(ProjectList(projects=projects), compact, sparse=True)
+
+    projects = []
+    async for page in paginate("/projects", max_items=max_items, keyset=True, decode=list_decoder(Project)):
+        projects.extend(page)
+
+    return _listing(response_model(ProjectList)(projects=projects), compact)
 
 
 @mcp.tool(title="Get GitLab Project Details")
-def get_project_details(project_id: int) -> ProjectDetails:
+async def get_project_details(project_id: int) -> ProjectDetails:
     """Get details of a specific GitLab project."""
 
-    response = gitlab_request("GET", f"/projects/{project_id}")
+    response = await gitlab_request("GET", f"/projects/{project_id}")
 
     return ProjectDetails(**response)
 
 
 @mcp.tool(title="List GitLab Project Issues")
-def list_project_issues(project_id: int) -> IssueList:
-    """List issues for a specific GitLab project."""
+async def list_project_issues(
+    project_id: int, max_items: Optional[int] = None, fields: Optional[list[str]] = None, compact: Optional[bool] = None
+) -> IssueList:
+    """List issues for a specific GitLab project, following pagination up to max_items (all when not set).
+
+    Pass fields (e.g. ["iid", "title", "state", "labels"]) to return only those Issue fields, and compact to
+    return them as a table of columns and rows (defaults to GITLAB_COMPACT_OUTPUT).
+    """
+
+    keep = _projection(Issue, fields)
+
+    if keep is not None:
+        issues = [
+            _build(Issue, issue, keep)
+            async for page in paginate(f"/projects/{project_id}/issues", max_items=max_items)
+            for issue in page
+        ]
+        return _listing(IssueList(issues=issues), compact, sparse=True)
 
-    response = gitlab_request("GET", f"/projects/{project_id}/issues")
+    issues = []
+    async for page in paginate(f"/projects/{project_id}/issues", max_items=max_items, decode=list_decoder(Issue)):
+        issues.extend(page)
+
+    return _listing(response_model(IssueList)(issues=issues), compact)
+
+
+@mcp.tool(title="Search GitLab Issues Across Projects")
+async def search_issues(payload: SearchIssuesRequest) -> IssueList:
+    """Find issues across several projects (project_ids), a group (group_id) or every accessible project.
+
+    Results of all projects are merged into one list sorted by order_by (updated_at, newest first, by
+    default); set max_items to stop once that many are found. Pass fields to return only those Issue fields.
+    """
+
+    keep = _projection(Issue, payload.fields)
+    params = _prepare_query_params(payload.model_dump(
+        exclude={'project_ids', 'group_id', 'per_page', 'max_items', 'fields', 'compact'}, exclude_none=True,
+    ))
+    endpoints = project_set_endpoints("issues", payload.project_ids, payload.group_id)
+    items = merge_sorted(
+        endpoints, params, payload.order_by, payload.sort == "desc", payload.per_page, payload.max_items,
+    )
 
-    return IssueList(issues=[Issue(**issue) for issue in response])
+    if keep is not None:
+        issues = [_build(Issue, issue, keep) async for issue in items]
+        return _listing(IssueList(issues=issues), payload.compact, sparse=True)
+
+    validate = item_validator(Issue)
+    return _listing(response_model(IssueList)(issues=[validate(issue) async for issue in items]), payload.compact)
+
+
+@mcp.tool(title="Sync GitLab Project Issues")
+async def sync_project_issues(payload: SyncRequest) -> IssueSync:
+    """Return the issues of a project changed since the previous sync (all issues on the first sync).
+
+    The server keeps a mirror of the project's issues and only requests those updated
+    after the most recent updated_at it has seen, so polling a project for changes
+    costs one small request. Pass since to get every issue updated after that time.
+    """
+
+    return response_model(IssueSync)(**await _sync(payload, "issues", Issue))
 
 
 @mcp.tool(title="Get GitLab Issue Details")
-def get_issue_details(project_id: int, issue_iid: int) -> Issue:
+async def get_issue_details(project_id: int, issue_iid: int) -> Issue:
     """Get details of a specific issue in a GitLab project."""
 
-    response = gitlab_request("GET", f"/projects/{project_id}/issues/{issue_iid}")
+    response = await gitlab_request("GET", f"/projects/{project_id}/issues/{issue_iid}")
 
     return Issue(**response)
 
 
+@mcp.tool(title="Get GitLab Issue Context")
+async def get_issue_context(payload: GetIssueContextRequest) -> IssueContext:
+    """Get an issue together with its notes, assignees and related merge requests in a single GraphQL request.
+
+    Replaces a get_issue_details, list_issue_notes and list_project_merge_requests round trip each.
+    """
+
+    context = await fetch_issue_context(payload.project_id, payload.issue_iid, payload.notes, payload.merge_requests)
+
+    return response_model(IssueContext)(**context)
+
+
 @mcp.tool(title="List GitLab Issue Notes")
-def list_issue_notes(payload: ListIssueNotesRequest) -> NoteList:
-    """List notes for a specific issue."""
+async def list_issue_notes(payload: ListIssueNotesRequest) -> NoteList:
+    """List notes for a specific issue. Set all_pages to page through every note of long threads."""
+
+    params = payload.model_dump(exclude={"project_id", "issue_iid", "all_pages", "compact"}, exclude_none=True)
+    if payload.all_pages:
+        validate = item_validator(Note)
+        notes = []
+        async for note, author in _thread_notes(payload.project_id, payload.issue_iid, params):
+            note = validate(note)
+            note.author = author
+            notes.append(note)
+        return _listing(response_model(NoteList)(notes=notes), payload.compact)
+
+    notes = await gitlab_request(
+        "GET", f"/projects/{payload.project_id}/issues/{payload.issue_iid}/notes", params=params,
+        decode=list_decoder(Note),
+    )
+
+    return _listing(response_model(NoteList)(notes=notes), payload.compact)
+
 
-    params = payload.model_dump(exclude={"project_id", "issue_iid"}, exclude_none=True)
-    response = gitlab_request(
-        "GET", f"/projects/{payload.project_id}/issues/{payload.issue_iid}/notes", params=params
+@mcp.tool(title="Load GitLab Issue Thread")
+async def load_issue_thread(payload: LoadIssueThreadRequest) -> IssueThread:
+    """Load every note of an issue, oldest first, in a compact shape for long threads.
+
+    Each author is listed once in authors and notes refer to it by author_id, so the response grows
+    with the number of participants rather than repeating the author with every note.
+    """
+
+    params = payload.model_dump(exclude={"project_id", "issue_iid", "max_items"}, exclude_none=True)
+    validate = item_validator(ThreadNote)
+    authors: dict[int, User] = {}
+    notes = []
+    async for note, author in _thread_notes(payload.project_id, payload.issue_iid, params, payload.max_items, authors):
+        notes.append(validate({**note, "author_id": author.id if author else None}))
+
+    return response_model(IssueThread)(
+        project_id=payload.project_id, issue_iid=payload.issue_iid, authors=list(authors.values()), notes=notes,
     )
 
-    return NoteList(notes=[Note(**note) for note in response])
 
+async def _thread_notes(
+    project_id, issue_iid: int, params: dict, max_items: Optional[int] = None, authors: Optional[dict[int, User]] = None,
+) -> AsyncIterator[tuple[dict, Optional[User]]]:
+    """Stream every note of an issue with its author split off and interned.
+
+    Notes are decoded one at a time as pages arrive, so a thread of thousands of
+    notes is never held as raw pages. Each distinct author is validated once and
+    the same ``User`` instance is returned for all of their notes (collected in
+    ``authors`` by user ID).
+    """
+    authors = {} if authors is None else authors
+    validate_user = item_validator(User)
+    params = {"sort": "asc", "order_by": "created_at", **params}
+    async for note in stream_items(f"/projects/{project_id}/issues/{issue_iid}/notes", params, max_items=max_items):
+        author = note.pop("author", None)
+        if author is not None:
+            interned = authors.get(author["id"])
+            if interned is None:
+                interned = authors[author["id"]] = validate_user(author)
+            author = interned
+        yield note, author
+
+
+def _merge_request_query(payload: MergeRequestFilters) -> tuple[dict[str, Any], Optional[set[str]]]:
+    """Return the query parameters for the filters of ``payload`` and the MergeRequest fields to keep."""
+
+    # Convert the payload to query parameters, excluding the project set, pagination settings, projection and None values
+    params = payload.model_dump(
+        exclude={'project_id', 'project_ids', 'group_id', 'per_page', 'max_items', 'fields', 'compact'}, exclude_none=True,
+    )
+
+    keep = _projection(MergeRequest, payload.fields)
+    if keep is not None and keep <= MERGE_REQUEST_SIMPLE_FIELDS:
+        params.setdefault('view', 'simple')
 
-@mcp.tool(title="List GitLab Project Merge Requests")
-def list_project_merge_requests(payload: ListMergeRequestsRequest) -> MergeRequestList:
-    """List all merge requests for a specific GitLab project with optional filtering."""
-    
-    # Convert the payload to query parameters, excluding project_id and None values
-    params = payload.model_dump(exclude={'project_id'}, exclude_none=True)
-    
     # Handle special formatting for iids parameter (needs to be iids[])
     if 'iids' in params and params['iids']:
         iids_list = params.pop('iids')
         for i, iid in enumerate(iids_list):
             params[f'iids[{i}]'] = iid
-    
-    response = gitlab_request("GET", f"/projects/{payload.project_id}/merge_requests", params=params)
-    
-    return MergeRequestList(merge_requests=[MergeRequest(**mr) for mr in response])
+
+    return params, keep
+
+
+@mcp.tool(title="List GitLab Project Merge Requests")
+async def list_project_merge_requests(payload: ListMergeRequestsRequest) -> MergeRequestList:
+    """List all merge requests for a specific GitLab project with optional filtering."""
+
+    params, keep = _merge_request_query(payload)
+
+    endpoint = f"/projects/{payload.project_id}/merge_requests"
+    if keep is not None:
+        merge_requests = [
+            _build(MergeRequest, mr, keep)
+            async for page in paginate(endpoint, params, per_page=payload.per_page, max_items=payload.max_items)
+            for mr in page
+        ]
+        return _listing(MergeRequestList(merge_requests=merge_requests), payload.compact, sparse=True)
+
+    merge_requests = []
+    async for page in paginate(
+        endpoint, params, per_page=payload.per_page, max_items=payload.max_items, decode=list_decoder(MergeRequest),
+    ):
+        merge_requests.extend(page)
+
+    return _listing(response_model(MergeRequestList)(merge_requests=merge_requests), payload.compact)
+
+
+@mcp.tool(title="Search GitLab Merge Requests Across Projects")
+async def search_merge_requests(payload: SearchMergeRequestsRequest) -> MergeRequestList:
+    """Find merge requests across several projects (project_ids), a group (group_id) or every accessible project.
+
+    Accepts the filters of list_project_merge_requests. Results of all projects are merged into one list
+    sorted by order_by (updated_at, newest first, by default); set max_items to stop once that many are found.
+    """
+
+    params, keep = _merge_request_query(payload)
+    endpoints = project_set_endpoints("merge_requests", payload.project_ids, payload.group_id)
+    items = merge_sorted(
+        endpoints, params, payload.order_by, payload.sort == "desc", payload.per_page, payload.max_items,
+    )
+
+    if keep is not None:
+        merge_requests = [_build(MergeRequest, mr, keep) async for mr in items]
+        return _listing(MergeRequestList(merge_requests=merge_requests), payload.compact, sparse=True)
+
+    validate = item_validator(MergeRequest)
+    return _listing(response_model(MergeRequestList)(merge_requests=[validate(mr) async for mr in items]), payload.compact)
+
+
+@mcp.tool(title="Sync GitLab Project Merge Requests")
+async def sync_project_merge_requests(payload: SyncRequest) -> MergeRequestSync:
+    """Return the merge requests of a project changed since the previous sync (all of them on the first sync).
+
+    Works like sync_project_issues, with a separate mirror of the project's merge requests.
+    """
+
+    return response_model(MergeRequestSync)(**await _sync(payload, "merge_requests", MergeRequest))
 
 
 @mcp.tool(title="Get single MR")
-def get_single_merge_request(payload: GetMergeRequestRequest) -> MergeRequest:
+async def get_single_merge_request(payload: GetMergeRequestRequest) -> MergeRequest:
     """Show detailed information about a single GitLab merge request."""
 
     params = payload.model_dump(exclude={'project_id', 'merge_request_iid'}, exclude_none=True)
     query_params = _prepare_query_params(params) if params else None
-    response = gitlab_request(
+    response = await gitlab_request(
         "GET",
         f"/projects/{payload.project_id}/merge_requests/{payload.merge_request_iid}",
         params=query_params,
@@ -130,23 +469,165 @@ def get_single_merge_request(payload: GetMergeRequestRequest) -> MergeRequest:
 
 
 @mcp.tool(title="List GitLab Project Labels")
-def list_project_labels(payload: ListLabelsRequest) -> LabelList:
+async def list_project_labels(payload: ListLabelsRequest) -> LabelList:
     """List all labels for a specific GitLab project with optional filtering."""
     
-    # Convert the payload to query parameters, excluding project_id and None values
-    params = payload.model_dump(exclude={'project_id'}, exclude_none=True)
-    
-    response = gitlab_request("GET", f"/projects/{payload.project_id}/labels", params=params)
-    
-    return LabelList(labels=[Label(**label) for label in response])
+    # Convert the payload to query parameters, excluding project_id, pagination settings and None values
+    params = payload.model_dump(exclude={'project_id', 'per_page', 'max_items', 'compact'}, exclude_none=True)
+    endpoint = f"/projects/{payload.project_id}/labels"
+
+    # Only the default listing is mirrored; any filter goes to GitLab
+    unfiltered = payload.model_fields_set <= {'project_id', 'per_page', 'max_items', 'compact'}
+    mirrored = await _from_mirror(endpoint, "name", payload.max_items) if unfiltered else None
+    if mirrored is not None:
+        validate = item_validator(Label)
+        return _listing(response_model(LabelList)(labels=[validate(label) for label in mirrored]), payload.compact)
+
+    labels = []
+    async for page in paginate(
+        endpoint, params,
+        per_page=payload.per_page, max_items=payload.max_items, decode=list_decoder(Label),
+    ):
+        labels.extend(page)
+
+    return _listing(response_model(LabelList)(labels=labels), payload.compact)
 
 
 @mcp.tool(title="List GitLab Users")
-def list_gitlab_users(payload: ListUsersRequest) -> UserList:
+async def list_gitlab_users(payload: ListUsersRequest) -> UserList:
     """List GitLab users with optional filtering and pagination."""
 
-    raw_params = payload.model_dump(exclude_none=True)
+    raw_params = payload.model_dump(exclude={'max_items', 'compact'}, exclude_none=True)
     params = _prepare_query_params(raw_params)
-    response = gitlab_request("GET", "/users", params=params or None)
 
-    return UserList(users=[User(**user) for user in response])
+    # An explicit page keeps the single-page behaviour
+    if payload.page:
+        users = await gitlab_request("GET", "/users", params=params, decode=list_decoder(User))
+        return _listing(response_model(UserList)(users=users), payload.compact)
+
+    per_page = params.pop('per_page')
+    mirrored = None if params else await _from_mirror("/users", "username", payload.max_items, keyset=True)
+    if mirrored is not None:
+        validate = item_validator(User)
+        return _listing(response_model(UserList)(users=[validate(user) for user in mirrored]), payload.compact)
+
+    users = []
+    async for page in paginate(
+        "/users", params, per_page=per_page, max_items=payload.max_items, keyset=True, decode=list_decoder(User),
+    ):
+        users.extend(page)
+
+    return _listing(response_model(UserList)(users=users), payload.compact)
+
+
+@mcp.tool(title="Find GitLab User")
+async def find_gitlab_user(username: str) -> User:
+    """Find a GitLab user by exact username. Served from the local metadata mirror when enabled."""
+
+    user = await metadata_mirror.get("/users", "username", username, keyset=True) if GITLAB_MIRROR_ENABLED else None
+    if user is None:
+        users = await gitlab_request("GET", "/users", params={"username": username})
+        if not users:
+            raise ValueError(f"No GitLab user with username {username}.")
+        user = users[0]
+
+    return User(**user)
+
+
+@mcp.tool(title="Find GitLab Project")
+async def find_gitlab_project(path_with_namespace: str) -> Project:
+    """Find a GitLab project by its full path (e.g. "group/subgroup/project"). Served from the local metadata mirror when enabled."""
+
+    if GITLAB_MIRROR_ENABLED:
+        project = await metadata_mirror.get("/projects", "path_with_namespace", path_with_namespace, keyset=True)
+        if project is not None:
+            return Project(**project)
+
+    return Project(**await gitlab_request("GET", f"/projects/{quote(path_with_namespace, safe='')}"))
+
+
+@mcp.tool(title="GitLab Issue Statistics")
+async def get_issue_statistics(payload: IssueStatisticsRequest) -> IssueStatistics:
+    """Count all, open and closed issues of a project, a group or every accessible project, with optional filters.
+
+    Answered by GitLab's issue statistics endpoint in one request, without listing the issues.
+    """
+
+    if payload.project_id is not None and payload.group_id is not None:
+        raise ValueError("Pass either project_id or group_id, not both.")
+    params = _prepare_query_params(payload.model_dump(exclude={'project_id', 'group_id'}, exclude_none=True))
+    if payload.project_id is not None:
+        endpoint = f"/projects/{payload.project_id}/issues_statistics"
+    elif payload.group_id is not None:
+        endpoint = f"/groups/{payload.group_id}/issues_statistics"
+    else:
+        # The instance-level statistics default to the caller's own issues
+        endpoint, params["scope"] = "/issues_statistics", "all"
+
+    response = await gitlab_request("GET", endpoint, params=params)
+    return IssueStatistics(**response["statistics"]["counts"])
+
+
+@mcp.tool(title="Count GitLab Issues by Label")
+async def count_issues_by_label(project_id: int, include_unused: bool = False) -> LabelCounts:
+    """Count the open and closed issues and open merge requests of every label of a project.
+
+    Uses the counts GitLab keeps per label (labels with_counts), so the issues are never listed.
+    Labels are ordered by open issues; unused labels are left out unless include_unused is set.
+    """
+
+    # Counts change with every issue edit, unlike the label list the cache keeps for minutes
+    labels = [
+        LabelCount(
+            name=label["name"],
+            open_issues=label.get("open_issues_count") or 0,
+            closed_issues=label.get("closed_issues_count") or 0,
+            open_merge_requests=label.get("open_merge_requests_count") or 0,
+        )
+        async for page in paginate(f"/projects/{project_id}/labels", {"with_counts": "true"}, use_cache=False)
+        for label in page
+    ]
+    if not include_unused:
+        labels = [label for label in labels if label.open_issues or label.closed_issues or label.open_merge_requests]
+
+    return LabelCounts(labels=sorted(labels, key=lambda label: (-label.open_issues, label.name)))
+
+
+async def _aggregate(payload: MirrorFilters, kind: SyncKind, group_by: str, age_of: str = "created_at") -> Aggregate:
+    """Sync the project's mirror of ``kind`` and count its items matching ``payload`` per ``group_by``."""
+    mirror, _, _ = await sync_store.sync(payload.project_id, kind)
+    filters = payload.model_dump(include={'labels', 'milestone', 'author_username', 'assignee_username'})
+    items = (
+        item for item in mirror.items.values()
+        if (payload.state == "all" or item["state"] == payload.state) and matches(item, **filters)
+    )
+    total, groups = aggregate(items, group_by, age_of=age_of)
+
+    return Aggregate(
+        group_by=group_by, total=total, groups=[AggregateGroup(key=key, count=count) for key, count in groups],
+        watermark=mirror.watermark,
+    )
+
+
+@mcp.tool(title="Aggregate GitLab Project Issues")
+async def aggregate_project_issues(payload: AggregateIssuesRequest) -> Aggregate:
+    """Count a project's issues per label, assignee, author, milestone, state, due date bucket or age bucket.
+
+    Computed from the server's mirror of the project's issues (see sync_project_issues), which is brought
+    up to date with a single request, so only the counts are returned. For plain open/closed totals use
+    get_issue_statistics, and for per-label totals without other filters count_issues_by_label.
+    """
+
+    return await _aggregate(payload, "issues", payload.group_by)
+
+
+@mcp.tool(title="Aggregate GitLab Project Merge Requests")
+async def aggregate_project_merge_requests(payload: AggregateMergeRequestsRequest) -> Aggregate:
+    """Count a project's merge requests per label, assignee, author, reviewer, milestone, state, target branch or age.
+
+    group_by age returns a histogram of merge request ages (from created_at, or from updated_at for the
+    time since their last activity). Computed from the server's mirror of the project's merge requests
+    (see sync_project_merge_requests), which is brought up to date with a single request.
+    """
+
+    return await _aggregate(payload, "merge_requests", payload.group_by, payload.age_of)